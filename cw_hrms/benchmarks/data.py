@@ -0,0 +1,232 @@
+# Copyright (c) 2026, Codeware Limited and contributors
+# For license information, please see license.txt
+
+import random
+from datetime import datetime, time, timedelta
+
+import frappe
+from frappe.utils import add_days, getdate, today
+
+from cw_hrms.cw_hrms.attendance_rollup import ROLLUP_DOCTYPE, clear_pending_rollup_refresh
+from cw_hrms.cw_hrms.attendance_writer import bulk_insert_attendance
+from cw_hrms.cw_hrms.naming import reserve_series_names
+
+# Every generated record hangs off these, so a dataset can be found and removed again
+BENCH_FIRST_NAME = "CW Bench"
+BENCH_HOLIDAY_LIST = "CW Bench Holidays"
+BENCH_SHIFTS = {
+    "CW Bench Day": (time(9, 0), time(18, 0)),
+    "CW Bench Night": (time(22, 0), time(6, 0)),
+}
+NIGHT_SHIFT_SHARE = 0.2
+PRESENT_RATE = 0.92
+HOLIDAY_RATE = 0.03
+CHECKIN_SERIES = "EMP-CKIN-.MM.-.YYYY.-.######"
+CHECKIN_FIELDS = (
+    "name",
+    "creation",
+    "modified",
+    "modified_by",
+    "owner",
+    "docstatus",
+    "naming_series",
+    "employee",
+    "employee_name",
+    "log_type",
+    "time",
+    "device_id",
+    "shift",
+    "shift_start",
+    "shift_end",
+    "shift_actual_start",
+    "shift_actual_end",
+    "skip_auto_attendance",
+)
+
+
+def generate_dataset(employees, days, seed=42, company=None):
+    """Create a reproducible dataset of `employees` × `days` ending yesterday.
+
+    Builds a holiday list (Friday weekly offs plus random holidays), a day and an
+    overnight shift, the employees, two checkins per worked shift and the submitted
+    attendance linked to them. The same seed always produces the same data.
+    """
+    rng = random.Random(seed)
+    company = company or get_default_company()
+    to_date = getdate(add_days(today(), -1))
+    from_date = getdate(add_days(to_date, -(days - 1)))
+
+    holidays = make_holiday_list(rng, from_date, to_date)
+    make_shift_types()
+    employee_shifts = make_employees(rng, employees, company, from_date)
+
+    for day in range(days):
+        date = add_days(from_date, day)
+        if date in holidays:
+            continue
+        make_day(rng, employee_shifts, date)
+        frappe.db.commit()
+
+    return frappe._dict(
+        company=company,
+        from_date=from_date,
+        to_date=to_date,
+        employees=sorted(employee_shifts),
+    )
+
+
+def get_default_company():
+    company = frappe.defaults.get_global_default("company") or frappe.db.get_value("Company", {}, "name")
+    if not company:
+        frappe.throw("A Company is required to generate benchmark data")
+    return company
+
+
+def make_holiday_list(rng, from_date, to_date):
+    holidays = {}
+    date = from_date
+    while date <= to_date:
+        if date.weekday() == 4:
+            holidays[date] = 1
+        elif rng.random() < HOLIDAY_RATE:
+            holidays[date] = 0
+        date = add_days(date, 1)
+
+    frappe.get_doc(
+        {
+            "doctype": "Holiday List",
+            "holiday_list_name": BENCH_HOLIDAY_LIST,
+            "from_date": from_date,
+            "to_date": to_date,
+            "holidays": [
+                {"holiday_date": date, "description": "Friday" if weekly_off else "Holiday", "weekly_off": weekly_off}
+                for date, weekly_off in sorted(holidays.items())
+            ],
+        }
+    ).insert(ignore_permissions=True)
+    return holidays
+
+
+def make_shift_types():
+    for name, (start_time, end_time) in BENCH_SHIFTS.items():
+        frappe.get_doc(
+            {
+                "doctype": "Shift Type",
+                "name": name,
+                "start_time": str(start_time),
+                "end_time": str(end_time),
+                "holiday_list": BENCH_HOLIDAY_LIST,
+                "enable_late_entry_marking": 1,
+                "late_entry_grace_period": 10,
+                "enable_early_exit_marking": 1,
+                "early_exit_grace_period": 10,
+                "begin_check_in_before_shift_start_time": 60,
+                "allow_check_out_after_shift_end_time": 60,
+            }
+        ).insert(ignore_permissions=True)
+
+
+def make_employees(rng, count, company, from_date):
+    employee_shifts = {}
+    for idx in range(count):
+        shift = "CW Bench Night" if rng.random() < NIGHT_SHIFT_SHARE else "CW Bench Day"
+        employee = frappe.get_doc(
+            {
+                "doctype": "Employee",
+                "first_name": BENCH_FIRST_NAME,
+                "last_name": str(idx + 1),
+                "gender": "Male",
+                "date_of_birth": "1990-01-01",
+                "date_of_joining": add_days(from_date, -1),
+                "company": company,
+                "status": "Active",
+                "default_shift": shift,
+                "holiday_list": BENCH_HOLIDAY_LIST,
+            }
+        ).insert(ignore_permissions=True)
+        employee_shifts[employee.name] = (shift, employee.employee_name)
+
+    frappe.db.commit()
+    return employee_shifts
+
+
+def make_day(rng, employee_shifts, date):
+    """Insert the checkins and attendance of every employee for one working day."""
+    checkins, attendance = [], []
+
+    for employee, (shift, employee_name) in sorted(employee_shifts.items()):
+        shift_start, shift_end = get_shift_window(shift, date)
+        if rng.random() >= PRESENT_RATE:
+            attendance.append({"employee": employee, "attendance_date": date, "status": "Absent", "shift": shift})
+            continue
+
+        in_time = shift_start + timedelta(minutes=round(rng.gauss(2, 8)))
+        out_time = shift_end + timedelta(minutes=round(rng.gauss(8, 15)))
+        window = (shift, shift_start, shift_end, shift_start - timedelta(hours=1), shift_end + timedelta(hours=1))
+        checkins.append((employee, employee_name, "IN", in_time, *window))
+        checkins.append((employee, employee_name, "OUT", out_time, *window))
+        attendance.append(
+            {
+                "employee": employee,
+                "attendance_date": date,
+                "status": "Present",
+                "shift": shift,
+                "in_time": in_time,
+                "out_time": out_time,
+                "working_hours": round((out_time - in_time).total_seconds() / 3600, 2),
+                "late_entry": in_time > shift_start + timedelta(minutes=10),
+                "early_exit": out_time < shift_end - timedelta(minutes=10),
+            }
+        )
+
+    names = insert_checkins(checkins)
+    by_employee = {}
+    for name, checkin in zip(names, checkins):
+        by_employee.setdefault(checkin[0], []).append(name)
+    for row in attendance:
+        row["checkins"] = by_employee.get(row["employee"], [])
+
+    bulk_insert_attendance(attendance)
+
+
+def get_shift_window(shift, date):
+    start_time, end_time = BENCH_SHIFTS[shift]
+    shift_start = datetime.combine(date, start_time)
+    shift_end = datetime.combine(date, end_time)
+    if shift_end <= shift_start:
+        shift_end += timedelta(days=1)
+    return shift_start, shift_end
+
+
+def insert_checkins(checkins):
+    names = reserve_series_names(CHECKIN_SERIES, len(checkins))
+    timestamp, user = frappe.utils.now(), frappe.session.user
+    frappe.db.bulk_insert(
+        "Employee Checkin",
+        CHECKIN_FIELDS,
+        [
+            (name, timestamp, timestamp, user, user, 0, CHECKIN_SERIES, *checkin[:4], "Benchmark", *checkin[4:], 1)
+            for name, checkin in zip(names, checkins)
+        ],
+    )
+    return names
+
+
+def delete_dataset():
+    """Remove everything `generate_dataset` created."""
+    employees = frappe.get_all("Employee", filters={"first_name": BENCH_FIRST_NAME}, pluck="name")
+    # roll-up refreshes queued by this process would otherwise rebuild the deleted rows on commit
+    clear_pending_rollup_refresh()
+    if employees:
+        frappe.db.delete(ROLLUP_DOCTYPE, {"employee": ("in", employees)})
+        frappe.db.delete("Attendance Daily Fact", {"employee": ("in", employees)})
+        frappe.db.delete("Attendance", {"employee": ("in", employees)})
+        frappe.db.delete("Employee Checkin", {"employee": ("in", employees)})
+        frappe.db.delete("Employee", {"name": ("in", employees)})
+
+    for shift in BENCH_SHIFTS:
+        frappe.db.delete("Checkin Watermark", {"name": shift})
+        frappe.db.delete("Shift Type", {"name": shift})
+    frappe.db.delete("Holiday", {"parent": BENCH_HOLIDAY_LIST})
+    frappe.db.delete("Holiday List", {"name": BENCH_HOLIDAY_LIST})
+    frappe.db.commit()
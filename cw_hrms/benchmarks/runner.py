@@ -0,0 +1,143 @@
+# Copyright (c) 2026, Codeware Limited and contributors
+# For license information, please see license.txt
+
+import math
+import platform
+import subprocess
+import time
+
+import frappe
+from frappe.utils import now
+
+import cw_hrms
+from cw_hrms.benchmarks.data import delete_dataset, generate_dataset
+from cw_hrms.cw_hrms import api
+from cw_hrms.cw_hrms.report.custom_shift_attendance import custom_shift_attendance
+from cw_hrms.cw_hrms.report_cache import clear_report_cache
+from cw_hrms.overrides import shift_attendance
+
+DEFAULT_SCALES = ((50, 30), (200, 30), (500, 90))
+DEFAULT_REPEAT = 5
+
+
+def run_benchmarks(scales=DEFAULT_SCALES, repeat=DEFAULT_REPEAT, seed=42, keep_data=False):
+    """Generate a dataset per scale, time every target on it and return the results.
+
+    Every timed run starts with the report and dashboard caches cleared, so the numbers
+    are for a cold request. Existing benchmark data is removed before each scale.
+    """
+    results = []
+    for employees, days in scales:
+        delete_dataset()
+        dataset = generate_dataset(employees, days, seed=seed)
+        try:
+            for target, run in get_targets(dataset):
+                results.append(
+                    {"target": target, "employees": employees, "days": days, **time_target(run, repeat, dataset)}
+                )
+        finally:
+            if not keep_data:
+                delete_dataset()
+
+    return {"meta": get_meta(seed, repeat), "results": results}
+
+
+def get_targets(dataset):
+    """(name, callable) pairs; each callable returns the number of rows it produced."""
+    employee = dataset.employees[0]
+    report_filters = {
+        "from_date": dataset.from_date,
+        "to_date": dataset.to_date,
+        "company": dataset.company,
+        "consider_grace_period": 1,
+    }
+
+    def custom_report():
+        # background_run keeps large ranges in this process instead of a queued job
+        return len(custom_shift_attendance.execute({**report_filters, "background_run": 1})[1])
+
+    def override_report():
+        return len(shift_attendance.execute(dict(report_filters))[1])
+
+    def attendance_summary():
+        api.get_employee_attendance_summary(employee, dataset.from_date, dataset.to_date)
+        return 1
+
+    def employees_attendance_summary():
+        return len(api.get_employees_attendance_summary(dataset.from_date, dataset.to_date, company=dataset.company))
+
+    def leave_balance():
+        return len(api.get_employee_leave_balance(employee))
+
+    def employees_leave_balance():
+        return len(api.get_employees_leave_balance(dataset.employees))
+
+    def todays_punch():
+        return api.get_employee_todays_punch(employee, dataset.to_date)["total_punches"]
+
+    def employee_dashboard():
+        api.get_employee_dashboard(employee, dataset.from_date, dataset.to_date)
+        return 1
+
+    return (
+        ("custom_shift_attendance.execute", custom_report),
+        ("overrides.shift_attendance.execute", override_report),
+        ("api.get_employee_attendance_summary", attendance_summary),
+        ("api.get_employees_attendance_summary", employees_attendance_summary),
+        ("api.get_employee_leave_balance", leave_balance),
+        ("api.get_employees_leave_balance", employees_leave_balance),
+        ("api.get_employee_todays_punch", todays_punch),
+        ("api.get_employee_dashboard", employee_dashboard),
+    )
+
+
+def time_target(run, repeat, dataset):
+    timings, rows = [], 0
+    for _ in range(repeat):
+        clear_report_cache()
+        api.clear_employee_dashboard_cache(employees=dataset.employees[:1])
+        start = time.perf_counter()
+        rows = run()
+        timings.append(time.perf_counter() - start)
+        frappe.db.rollback()
+
+    mean = sum(timings) / len(timings)
+    return {
+        "rows": rows,
+        "runs": len(timings),
+        "mean_ms": round(mean * 1000, 3),
+        "p50_ms": round(percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(percentile(timings, 95) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "max_ms": round(max(timings) * 1000, 3),
+        "rows_per_sec": round(rows / mean, 1) if mean else None,
+    }
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    values = sorted(values)
+    return values[max(math.ceil(pct / 100 * len(values)) - 1, 0)]
+
+
+def get_meta(seed, repeat):
+    return {
+        "timestamp": now(),
+        "site": frappe.local.site,
+        "cw_hrms_version": cw_hrms.__version__,
+        "cw_hrms_commit": get_commit(),
+        "frappe_version": frappe.__version__,
+        "db_version": frappe.db.sql("SELECT VERSION()")[0][0],
+        "python_version": platform.python_version(),
+        "seed": seed,
+        "repeat": repeat,
+    }
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=frappe.get_app_path("cw_hrms"), text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except Exception:
+        return None
@@ -0,0 +1,103 @@
+import click
+from frappe.commands import get_site, pass_context
+
+
+@click.command("rebuild-attendance-facts")
+@click.option("--from-date", required=True, help="First attendance date to rebuild")
+@click.option("--to-date", required=True, help="Last attendance date to rebuild")
+@click.option("--company", help="Only rebuild attendance of this company")
+@pass_context
+def rebuild_attendance_facts(context, from_date, to_date, company=None):
+    "Backfill the Attendance Daily Fact table for a date range"
+    import frappe
+
+    from cw_hrms.cw_hrms.attendance_fact import rebuild_attendance_facts as rebuild
+
+    frappe.init(site=get_site(context))
+    frappe.connect()
+    try:
+        rebuild(from_date, to_date, company=company)
+    finally:
+        frappe.destroy()
+
+
+@click.command("rebuild-attendance-rollups")
+@click.option("--from-date", required=True, help="A date in the first month to roll up")
+@click.option("--to-date", required=True, help="A date in the last month to roll up")
+@pass_context
+def rebuild_attendance_rollups(context, from_date, to_date):
+    "Backfill or rebuild the Attendance Monthly Rollup table for the closed months of a date range"
+    import frappe
+
+    from cw_hrms.cw_hrms.attendance_rollup import rebuild_monthly_rollups
+
+    frappe.init(site=get_site(context))
+    frappe.connect()
+    try:
+        rebuild_monthly_rollups(from_date, to_date)
+    finally:
+        frappe.destroy()
+
+
+@click.command("compact-punches")
+@click.option("--from-date", required=True, help="First punch date to compact")
+@click.option("--to-date", required=True, help="Last punch date to compact")
+@click.option("--window", type=int, help="Debounce window in seconds, General Settings by default")
+@pass_context
+def compact_punches(context, from_date, to_date, window=None):
+    "Delete repeat Employee Checkins within the debounce window for a date range"
+    import frappe
+
+    from cw_hrms.cw_hrms.punch_debounce import compact_duplicate_punches
+
+    frappe.init(site=get_site(context))
+    frappe.connect()
+    try:
+        deleted = compact_duplicate_punches(from_date, to_date, window=window)
+        click.echo(f"Deleted {deleted} duplicate punches")
+    finally:
+        frappe.destroy()
+
+
+@click.command("run-cw-hrms-benchmarks")
+@click.option(
+    "--scale",
+    "scales",
+    multiple=True,
+    help="Dataset size as EMPLOYEESxDAYS, e.g. 200x30; repeat for several scales",
+)
+@click.option("--repeat", default=5, type=int, help="Timed runs per target and scale")
+@click.option("--seed", default=42, type=int, help="Seed of the data generator")
+@click.option("--output", help="Write the JSON results to this file instead of stdout")
+@click.option("--keep-data", is_flag=True, default=False, help="Leave the generated data in the site")
+@pass_context
+def run_benchmarks(context, scales, repeat, seed, output=None, keep_data=False):
+    "Time the attendance reports and APIs on generated data (test sites only)"
+    import frappe
+
+    from cw_hrms.benchmarks.runner import DEFAULT_SCALES
+    from cw_hrms.benchmarks.runner import run_benchmarks as run
+
+    try:
+        scales = [tuple(int(part) for part in scale.lower().split("x")) for scale in scales] or DEFAULT_SCALES
+    except ValueError:
+        raise click.BadParameter("Scales must look like EMPLOYEESxDAYS, e.g. 200x30")
+
+    frappe.init(site=get_site(context))
+    frappe.connect()
+    try:
+        # The generator writes employees, checkins and attendance, keep it off production sites
+        if not frappe.conf.allow_tests:
+            raise click.ClickException("Benchmarks can only run on sites with allow_tests enabled")
+
+        results = frappe.as_json(run(scales, repeat=repeat, seed=seed, keep_data=keep_data))
+        if output:
+            with open(output, "w") as f:
+                f.write(results)
+        else:
+            click.echo(results)
+    finally:
+        frappe.destroy()
+
+
+commands = [rebuild_attendance_facts, rebuild_attendance_rollups, compact_punches, run_benchmarks]
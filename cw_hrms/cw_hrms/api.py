@@ -1,90 +1,192 @@
 # cw_hrms/cw_hrms/api.py
+import hashlib
 import frappe
 from frappe import _
 from datetime import datetime, timedelta
+from frappe.utils import cint, getdate
+from hrms.hr.doctype.leave_application.leave_application import get_number_of_leave_days
+
+from cw_hrms.cw_hrms.attendance_rollup import get_attendance_counters
+from cw_hrms.cw_hrms.shift_resolver import ShiftResolver
 
 @frappe.whitelist()
 def get_employee_attendance_summary(employee, from_date, to_date):
     """Get employee attendance summary for a date range"""
     
-    # Get attendance records
-    attendance_records = frappe.db.sql("""
-        SELECT status, COUNT(*) as count
-        FROM `tabAttendance`
-        WHERE employee = %s 
-        AND attendance_date BETWEEN %s AND %s
-        AND docstatus = 1
-        GROUP BY status
-    """, (employee, from_date, to_date), as_dict=1)
-    
-    # Get late entries (assuming you have a 'late_entry' field)
-    late_count = frappe.db.sql("""
-        SELECT COUNT(*) as count
-        FROM `tabAttendance`
-        WHERE employee = %s 
-        AND attendance_date BETWEEN %s AND %s
-        AND late_entry = 1
-        AND docstatus = 1
-    """, (employee, from_date, to_date))[0][0]
-    
-    # Initialize counts
-    summary = {
-        'present': 0,
-        'absent': 0,
-        'late': int(late_count) if late_count else 0,
-        'leave': 0
+    return get_employees_attendance_summary(from_date, to_date, employees=[employee])[employee]
+
+@frappe.whitelist()
+def get_employees_attendance_summary(from_date, to_date, employees=None, department=None, company=None):
+    """Get attendance summary of many employees for a date range, grouped in SQL"""
+    
+    if isinstance(employees, str):
+        employees = frappe.parse_json(employees)
+    
+    if not (employees or department or company):
+        frappe.throw(_("Please select employees, a department or a company"))
+    
+    frappe.has_permission("Attendance", "read", throw=True)
+    if department:
+        frappe.has_permission("Department", "read", department, throw=True)
+    if company:
+        frappe.has_permission("Company", "read", company, throw=True)
+    
+    # The department is matched on the attendance, as employees may have moved since
+    readable = get_permitted_employees(employees, company=company)
+    if not readable:
+        return {}
+    
+    # Closed months come from the monthly roll-ups, only the rest of the range is scanned
+    records = get_attendance_counters(frappe._dict(
+        from_date=from_date,
+        to_date=to_date,
+        employees=readable,
+        department=department,
+        company=company,
+        consider_grace_period=1
+    ), group_by=("employee",))
+    
+    # Employees asked for explicitly get a zero summary even without attendance
+    summaries = {
+        emp: {'present': 0, 'absent': 0, 'late': 0, 'leave': 0}
+        for emp in employees or []
     }
     
-    # Map attendance records
-    for record in attendance_records:
-        if record.status == 'Present':
-            summary['present'] = record.count
-        elif record.status == 'Absent':
-            summary['absent'] = record.count
-        elif record.status == 'On Leave':
-            summary['leave'] = record.count
+    for record in records:
+        summaries[record.employee] = {
+            'present': record.present_records,
+            'absent': record.absent_records,
+            'late': record.late_entry_records,
+            'leave': record.leave_records
+        }
     
-    return summary
+    return summaries
+
+def get_permitted_employees(employees=None, company=None):
+    """Employees the user can read, user permissions included, of the given ones and company.
+    
+    Throws when some of the given employees are not readable."""
+    
+    employee_filters = {}
+    if employees:
+        employee_filters["name"] = ["in", employees]
+    if company:
+        employee_filters["company"] = company
+    readable = frappe.get_list("Employee", filters=employee_filters, pluck="name", limit_page_length=0)
+    
+    if employees and set(employees) - set(readable):
+        frappe.throw(_("Not permitted to read some of these employees"), frappe.PermissionError)
+    return readable
 
 @frappe.whitelist()
 def get_employee_leave_balance(employee):
     """Get employee leave balance summary"""
     
-    # Get allocation records
+    return get_employees_leave_balance([employee]).get(employee, [])
+
+@frappe.whitelist()
+def get_employees_leave_balance(employees, date=None):
+    """Get leave balance summary of many employees, grouped by employee"""
+    
+    if isinstance(employees, str):
+        employees = frappe.parse_json(employees)
+    
+    if not employees:
+        return {}
+    
+    # Only employees the user can read, user permissions included
+    get_permitted_employees(employees)
+    
+    values = {
+        'employees': tuple(employees),
+        'date': date or frappe.utils.today()
+    }
+    
+    # Approved applications are joined to every allocation they overlap, as HRMS
+    # get_leaves_for_period does; the ones inside the allocation are summed in SQL
     allocations = frappe.db.sql("""
         SELECT 
+            la.name,
+            la.employee,
             la.leave_type,
             la.total_leaves_allocated as total_leaves,
-            COALESCE(
-                (SELECT SUM(leave_days) 
-                 FROM `tabLeave Application` 
-                 WHERE employee = %s 
-                 AND leave_type = la.leave_type 
-                 AND status = 'Approved'
-                 AND docstatus = 1), 0
-            ) as leaves_taken
+            COALESCE(SUM(CASE
+                WHEN app.from_date >= la.from_date AND app.to_date <= la.to_date
+                THEN app.total_leave_days
+            END), 0) as leaves_taken
         FROM `tabLeave Allocation` la
-        WHERE la.employee = %s 
+        LEFT JOIN `tabLeave Application` app
+            ON app.employee = la.employee
+            AND app.leave_type = la.leave_type
+            AND app.status = 'Approved'
+            AND app.docstatus = 1
+            AND app.from_date <= la.to_date
+            AND app.to_date >= la.from_date
+        WHERE la.employee IN %(employees)s
         AND la.docstatus = 1
-        AND %s BETWEEN la.from_date AND la.to_date
-    """, (employee, employee, frappe.utils.today()), as_dict=1)
+        AND %(date)s BETWEEN la.from_date AND la.to_date
+        GROUP BY la.name
+        ORDER BY la.employee, la.leave_type
+    """, values, as_dict=1)
+
+    # Applications straddling an allocation boundary only count their days inside it
+    straddling = frappe.db.sql("""
+        SELECT 
+            la.name as allocation,
+            app.employee,
+            app.leave_type,
+            GREATEST(app.from_date, la.from_date) as from_date,
+            LEAST(app.to_date, la.to_date) as to_date,
+            app.half_day,
+            app.half_day_date
+        FROM `tabLeave Allocation` la
+        INNER JOIN `tabLeave Application` app
+            ON app.employee = la.employee
+            AND app.leave_type = la.leave_type
+            AND app.status = 'Approved'
+            AND app.docstatus = 1
+            AND app.from_date <= la.to_date
+            AND app.to_date >= la.from_date
+            AND (app.from_date < la.from_date OR app.to_date > la.to_date)
+        WHERE la.employee IN %(employees)s
+        AND la.docstatus = 1
+        AND %(date)s BETWEEN la.from_date AND la.to_date
+    """, values, as_dict=1)
+
+    if straddling:
+        clipped_days = {}
+        for app in straddling:
+            half_day = app.half_day and app.half_day_date and app.from_date <= app.half_day_date <= app.to_date
+            clipped_days[app.allocation] = clipped_days.get(app.allocation, 0) + get_number_of_leave_days(
+                app.employee,
+                app.leave_type,
+                app.from_date,
+                app.to_date,
+                half_day=1 if half_day else 0,
+                half_day_date=app.half_day_date if half_day else None,
+            )
+        for alloc in allocations:
+            alloc['leaves_taken'] += clipped_days.get(alloc.name, 0)
     
     # Calculate balance
+    balances = {}
     for alloc in allocations:
-        alloc['balance_leaves'] = alloc['total_leaves'] - alloc['leaves_taken']
-        alloc['balance_leaves'] = round(alloc['balance_leaves'], 2)
+        employee = alloc.pop('employee')
+        alloc.pop('name')
+        alloc['balance_leaves'] = round(alloc['total_leaves'] - alloc['leaves_taken'], 2)
+        balances.setdefault(employee, []).append(alloc)
     
-    return allocations
+    return balances
 
 @frappe.whitelist()
 def get_employee_todays_punch(employee, date):
     """Get today's RFID punch records"""
     
-    # Check if Employee Checkin doctype exists (v15+)
     punches = []
     
-    if frappe.db.exists('DocType', 'Employee Checkin'):
-        # For Frappe HR / ERPNext v15+
+    if checkin_doctype_exists():
+        # Half-open range on `time` so the (employee, time) index is used
+        window_start, window_end = get_punch_window(employee, date)
         checkins = frappe.db.sql("""
             SELECT 
                 time,
@@ -93,17 +195,13 @@ def get_employee_todays_punch(employee, date):
                 'Success' as status
             FROM `tabEmployee Checkin`
             WHERE employee = %s 
-            AND DATE(time) = %s
+            AND time >= %s
+            AND time < %s
             ORDER BY time
-        """, (employee, date), as_dict=1)
+        """, (employee, window_start, window_end), as_dict=1)
         
         punches = checkins
     
-    elif frappe.db.exists('DocType', 'Employee Checkin'):
-        # Fallback to old method if different structure
-        # You might need to adjust this based on your actual doctype structure
-        pass
-    
     # If no punches found, try to get from Attendance Check
     if not punches and frappe.db.exists('DocType', 'Attendance'):
         # Try to get check-in/out times from attendance
@@ -132,4 +230,145 @@ def get_employee_todays_punch(employee, date):
     return {
         'punches': punches,
         'total_punches': len(punches)
-    }
\ No newline at end of file
+    }
+
+# Resolved once per process and site, the doctype does not come and go at runtime
+_checkin_doctype_exists = {}
+
+def checkin_doctype_exists():
+    """Check if Employee Checkin doctype exists (Frappe HR / ERPNext v15+)"""
+    
+    site = frappe.local.site
+    if site not in _checkin_doctype_exists:
+        _checkin_doctype_exists[site] = bool(frappe.db.exists('DocType', 'Employee Checkin'))
+    
+    return _checkin_doctype_exists[site]
+
+# Punch windows are resolved once per employee and day; any shift assignment, shift type,
+# holiday list or employee change moves the version, which orphans every cached window
+PUNCH_WINDOW_CACHE_PREFIX = "cw_hrms:punch_window"
+PUNCH_WINDOW_VERSION_KEY = "cw_hrms:punch_window:version"
+PUNCH_WINDOW_CACHE_TTL = 24 * 60 * 60
+
+def get_punch_window(employee, date):
+    """Get the [start, end) timestamps of an employee's punches for a day, cached"""
+    
+    date = getdate(date)
+    cache = frappe.cache()
+    key = f"{PUNCH_WINDOW_CACHE_PREFIX}:{cache.get_value(PUNCH_WINDOW_VERSION_KEY)}:{employee}:{date}"
+    
+    window = cache.get_value(key)
+    if window is None:
+        window = resolve_punch_window(employee, date)
+        cache.set_value(key, window, expires_in_sec=PUNCH_WINDOW_CACHE_TTL)
+    
+    return window
+
+def resolve_punch_window(employee, date):
+    """Get the [start, end) timestamps of an employee's punches for a day.
+    
+    The window is the calendar day, moved forward past the check-out window of an
+    overnight shift that started the day before, and extended into the next
+    morning when the day's own shift crosses midnight. Shifts come from
+    ShiftResolver, so assignments, the default shift and holidays follow the report."""
+    
+    window_start = datetime.combine(date, datetime.min.time())
+    window_end = window_start + timedelta(days=1)
+    
+    # the resolver loads a day of margin on both sides, which covers the day before
+    resolver = ShiftResolver([employee], date, date)
+    for shift in resolver.by_date.get((employee, date - timedelta(days=1)), []):
+        if shift.end.date() > shift.start.date():
+            window_start = max(window_start, shift.actual_end)
+    
+    for shift in resolver.by_date.get((employee, date), []):
+        if shift.end.date() > date:
+            window_end = max(window_end, shift.actual_end)
+    
+    return window_start, window_end
+
+def clear_punch_window_cache(doc=None, method=None):
+    frappe.cache().set_value(PUNCH_WINDOW_VERSION_KEY, frappe.generate_hash(length=10))
+
+# Employee dashboard
+# ------------------
+# The dashboard polls one endpoint. The attendance summary and leave balance change
+# only when attendance or leave documents do, so each part is cached under its own key
+# and TTL. Doc events move the employee's generation, which orphans all of the employee's
+# parts until they expire; today's punches are always read live.
+
+EMPLOYEE_DASHBOARD_CACHE_PREFIX = "cw_hrms:employee_dashboard"
+
+# Default, overridable from site_config
+EMPLOYEE_DASHBOARD_CACHE_TTL = 10 * 60
+
+@frappe.whitelist()
+def get_employee_dashboard(employee=None, from_date=None, to_date=None):
+    """Get attendance summary, leave balance and today's punches in one response.
+    
+    Answers with 304 Not Modified when the client's If-None-Match matches the ETag
+    of the payload."""
+    
+    employee = employee or frappe.db.get_value('Employee', {'user_id': frappe.session.user}, 'name')
+    if not employee:
+        frappe.throw(_("No employee is linked to user {0}").format(frappe.session.user))
+    frappe.has_permission('Employee', 'read', employee, throw=True)
+    
+    today = getdate()
+    from_date = getdate(from_date) if from_date else today.replace(day=1)
+    to_date = getdate(to_date) if to_date else today
+    
+    summary = get_cached_dashboard_part(employee, f"summary|{from_date}|{to_date}",
+        lambda: get_employees_attendance_summary(from_date, to_date, employees=[employee])[employee])
+    leave_balance = get_cached_dashboard_part(employee, f"leave_balance|{today}",
+        lambda: get_employees_leave_balance([employee], today).get(employee, []))
+    
+    payload = {
+        'employee': employee,
+        'from_date': from_date,
+        'to_date': to_date,
+        'attendance_summary': summary,
+        'leave_balance': leave_balance,
+        'todays_punch': get_employee_todays_punch(employee, today)
+    }
+    
+    return build_dashboard_response(payload)
+
+def get_cached_dashboard_part(employee, part, build):
+    cache = frappe.cache()
+    generation = cache.get_value(get_dashboard_generation_key(employee))
+    key = f"{EMPLOYEE_DASHBOARD_CACHE_PREFIX}:{employee}:{generation}:{part}"
+    
+    value = cache.get_value(key)
+    if value is None:
+        value = build()
+        ttl = cint(frappe.conf.get('cw_hrms_dashboard_cache_ttl')) or EMPLOYEE_DASHBOARD_CACHE_TTL
+        cache.set_value(key, value, expires_in_sec=ttl)
+    
+    return value
+
+def get_dashboard_generation_key(employee):
+    return f"{EMPLOYEE_DASHBOARD_CACHE_PREFIX}:{employee}:generation"
+
+def build_dashboard_response(payload):
+    """JSON response with an ETag, or an empty 304 when the client already has it"""
+    
+    from werkzeug.wrappers import Response
+    
+    body = frappe.as_json({'message': payload}, indent=None)
+    etag = hashlib.sha1(body.encode()).hexdigest()
+    headers = {'ETag': f'"{etag}"', 'Cache-Control': 'private, no-cache'}
+    
+    if_none_match = frappe.get_request_header('If-None-Match') or ''
+    if etag in [tag.strip().removeprefix('W/').strip('"') for tag in if_none_match.split(',')]:
+        return Response(status=304, headers=headers)
+    
+    return Response(body, status=200, headers=headers, mimetype='application/json')
+
+def clear_employee_dashboard_cache(doc=None, method=None, employees=None):
+    """Drop cached dashboard parts of the document's employee (or the given employees)"""
+    
+    employees = employees or ([doc.employee] if doc and doc.get('employee') else [])
+    cache = frappe.cache()
+    for employee in set(employees):
+        cache.set_value(get_dashboard_generation_key(employee), frappe.generate_hash(length=10))
@@ -0,0 +1,165 @@
+# Copyright (c) 2026, Codeware Limited and contributors
+# For license information, please see license.txt
+
+import csv
+from datetime import datetime, time
+
+import frappe
+from frappe import _
+
+from cw_hrms.cw_hrms.attendance_fact import facts_cover
+from cw_hrms.cw_hrms.holiday_calendar import get_company_holiday_lists, get_holiday_calendar
+from cw_hrms.cw_hrms.report.custom_shift_attendance.custom_shift_attendance import (
+    REPORT_FILTER_KEYS,
+    get_columns,
+    get_fact_query,
+    get_query,
+    get_shift_resolver,
+    render_fact_rows,
+    transform_rows,
+)
+from cw_hrms.cw_hrms.report_cache import get_filters_key
+from cw_hrms.cw_hrms.report_payload import paginate
+from cw_hrms.cw_hrms_settings.doctype.general_settings.general_settings import get_general_settings
+
+REPORT_NAME = "Custom Shift Attendance"
+EXPORT_FORMATS = ("CSV", "Excel")
+EXPORT_CHUNK_SIZE = 5000
+
+
+@frappe.whitelist()
+def export_shift_attendance(filters, file_format="CSV"):
+    """Queue a streaming export of the report; the file link is pushed to the user when ready."""
+    filters = frappe._dict(frappe.parse_json(filters))
+    # the file gets formatted values, never the compact codes of the report view
+    filters.compact = 0
+    if file_format not in EXPORT_FORMATS:
+        frappe.throw(_("Export format must be one of {0}").format(", ".join(EXPORT_FORMATS)))
+    if not frappe.get_doc("Report", REPORT_NAME).is_permitted():
+        frappe.throw(_("Not permitted to export {0}").format(REPORT_NAME), frappe.PermissionError)
+
+    frappe.enqueue(
+        run_export,
+        queue="long",
+        timeout=4 * 3600,
+        job_id=f"cw_hrms::attendance_export::{frappe.session.user}::{file_format}::"
+        f"{get_filters_key(filters, REPORT_FILTER_KEYS)}",
+        deduplicate=True,
+        filters=filters,
+        file_format=file_format,
+    )
+    return _("The export is being prepared, you will get a download link when it is ready.")
+
+
+def run_export(filters, file_format):
+    """Write the report rows into a private file one keyset page at a time, so memory stays flat."""
+    filters = frappe._dict(filters)
+    filters.compact = 0
+    columns = [c for c in get_columns() if not c.get("hidden")]
+    use_facts = facts_cover(filters.get("from_date"))
+
+    settings = get_general_settings()
+    company_holiday_lists = get_company_holiday_lists(frappe.get_all("Company", pluck="name"))
+    holiday_calendar = get_holiday_calendar(frappe.get_all("Holiday List", pluck="name"))
+
+    def transform(chunk):
+        if use_facts:
+            return render_fact_rows(chunk, filters)
+        # shifts are resolved for the chunk's employees and dates only
+        resolver = get_shift_resolver(chunk, filters)
+        return transform_rows(chunk, filters, company_holiday_lists, holiday_calendar, settings, resolver)
+
+    extension = "csv" if file_format == "CSV" else "xlsx"
+    file_name = f"{frappe.scrub(REPORT_NAME)}_{filters.get('from_date')}_{filters.get('to_date')}_" \
+        f"{frappe.generate_hash(length=6)}.{extension}"
+    path = frappe.get_site_path("private", "files", file_name)
+    writer = write_csv if file_format == "CSV" else write_xlsx
+    row_count = writer(path, columns, (transform(chunk) for chunk in iter_chunks(filters, use_facts)))
+
+    file_doc = frappe.get_doc(
+        {
+            "doctype": "File",
+            "file_name": file_name,
+            "file_url": f"/private/files/{file_name}",
+            "is_private": 1,
+        }
+    ).insert(ignore_permissions=True)
+    frappe.db.commit()
+
+    frappe.publish_realtime(
+        "cw_hrms_export_ready",
+        {"report_name": REPORT_NAME, "file_url": file_doc.file_url, "rows": row_count},
+        user=frappe.session.user,
+    )
+
+
+def iter_chunks(filters, use_facts):
+    """Yield the report's query rows in keyset pages of (attendance_date, employee, name)."""
+    if use_facts:
+        fact = frappe.qb.DocType("Attendance Daily Fact")
+        query, keys = get_fact_query(filters), (fact.attendance_date, fact.employee, fact.attendance)
+    else:
+        attendance = frappe.qb.DocType("Attendance")
+        query, keys = get_query(filters), (attendance.attendance_date, attendance.employee, attendance.name)
+
+    after = None
+    while True:
+        chunk = paginate(query, keys, after, EXPORT_CHUNK_SIZE).run(as_dict=True)
+        if not chunk:
+            return
+        last = chunk[-1]
+        after = [last.attendance_date, last.employee, last.name]
+        yield chunk
+        if len(chunk) < EXPORT_CHUNK_SIZE:
+            return
+
+
+def write_csv(path, columns, chunks):
+    row_count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([column["label"] for column in columns])
+        for chunk in chunks:
+            writer.writerows(get_values(chunk, columns))
+            row_count += len(chunk)
+            publish_export_progress(row_count)
+    return row_count
+
+
+def write_xlsx(path, columns, chunks):
+    from openpyxl import Workbook
+
+    # write-only workbooks stream rows to a temporary file instead of keeping them in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(_(REPORT_NAME)[:31])
+    sheet.append([column["label"] for column in columns])
+
+    row_count = 0
+    for chunk in chunks:
+        for values in get_values(chunk, columns):
+            sheet.append(values)
+        row_count += len(chunk)
+        publish_export_progress(row_count)
+
+    workbook.save(path)
+    return row_count
+
+
+def get_values(chunk, columns):
+    for d in chunk:
+        yield [to_cell(d.get(column["fieldname"])) for column in columns]
+
+
+def to_cell(value):
+    if isinstance(value, time | datetime):
+        return str(value)
+    return value
+
+
+def publish_export_progress(row_count):
+    # the total is unknown while streaming, so progress is reported as rows written
+    frappe.publish_realtime(
+        "cw_hrms_export_progress",
+        {"report_name": REPORT_NAME, "rows": row_count},
+        user=frappe.session.user,
+    )
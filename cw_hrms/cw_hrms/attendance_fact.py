@@ -0,0 +1,300 @@
+# Copyright (c) 2026, Codeware Limited and contributors
+# For license information, please see license.txt
+
+import math
+from datetime import timedelta
+
+import frappe
+from frappe.utils import add_years, create_batch, getdate, now, today
+
+from cw_hrms.cw_hrms.attendance_kernel import compute_row_metrics
+from cw_hrms.cw_hrms.holiday_calendar import get_company_holiday_lists, get_day_type, get_holiday_calendar
+from cw_hrms.cw_hrms.shift_resolver import ShiftResolver
+from cw_hrms.cw_hrms_settings.doctype.general_settings.general_settings import (
+    get_general_settings,
+    load_general_settings,
+)
+
+FACT_DOCTYPE = "Attendance Daily Fact"
+FACTS_SINCE_KEY = "cw_hrms_attendance_fact_since"
+# the grace minutes the facts' late/early seconds were computed with
+FACTS_GRACE_KEY = "cw_hrms_attendance_fact_grace"
+FACT_BATCH_SIZE = 500
+
+FACT_FIELDS = (
+    "attendance",
+    "employee",
+    "employee_name",
+    "attendance_date",
+    "status",
+    "day_type",
+    "shift",
+    "department",
+    "company",
+    "in_epoch",
+    "out_epoch",
+    "shift_start_epoch",
+    "shift_end_epoch",
+    "working_seconds",
+    "late_seconds",
+    "early_seconds",
+    "late_entry",
+    "early_exit",
+)
+
+
+def get_facts_since():
+    """Return the date from which the fact table is complete, None if it was never built."""
+    since = frappe.db.get_default(FACTS_SINCE_KEY)
+    return getdate(since) if since else None
+
+
+def facts_cover(from_date):
+    since = get_facts_since()
+    return bool(since and from_date and getdate(from_date) >= since)
+
+
+def refresh_attendance_facts(attendance_names):
+    """Recompute the facts of the given attendances; cancelled or deleted ones are removed."""
+    for names in create_batch(list(set(attendance_names)), FACT_BATCH_SIZE):
+        rows = get_attendance_rows(names)
+        stale = set(names) - {row.name for row in rows}
+        if stale:
+            frappe.db.delete(FACT_DOCTYPE, {"name": ("in", list(stale))})
+        upsert_facts(build_facts(rows))
+
+
+def rebuild_attendance_facts(from_date, to_date, company=None):
+    """Backfill the fact table for a date range, committing after every batch."""
+    from_date, to_date = getdate(from_date), getdate(to_date)
+    filters = {"docstatus": 1, "attendance_date": ["between", [from_date, to_date]]}
+    if company:
+        filters["company"] = company
+
+    names = frappe.get_all("Attendance", filters=filters, pluck="name", order_by="attendance_date")
+    for batch in create_batch(names, FACT_BATCH_SIZE):
+        refresh_attendance_facts(batch)
+        frappe.db.commit()
+
+    # Coverage only extends when the rebuilt range joins up with what doc events keep current
+    since = get_facts_since()
+    if not company and (to_date >= (since - timedelta(days=1) if since else getdate(today()))):
+        frappe.db.set_default(FACTS_SINCE_KEY, str(min(from_date, since or from_date)))
+        if not since:
+            frappe.db.set_default(FACTS_GRACE_KEY, get_grace_stamp(get_general_settings()))
+        frappe.db.commit()
+
+
+@frappe.whitelist()
+def enqueue_rebuild_attendance_facts(from_date, to_date, company=None):
+    frappe.only_for("System Manager")
+    frappe.enqueue(
+        rebuild_attendance_facts,
+        queue="long",
+        timeout=4 * 60 * 60,
+        from_date=from_date,
+        to_date=to_date,
+        company=company,
+    )
+
+
+def get_attendance_rows(attendance_names):
+    attendance = frappe.qb.DocType("Attendance")
+    shift_type = frappe.qb.DocType("Shift Type")
+    employee = frappe.qb.DocType("Employee")
+
+    return (
+        frappe.qb.from_(attendance)
+        .left_join(shift_type).on(attendance.shift == shift_type.name)
+        .left_join(employee).on(attendance.employee == employee.name)
+        .select(
+            attendance.name,
+            attendance.employee,
+            attendance.employee_name,
+            attendance.attendance_date,
+            attendance.status,
+            attendance.shift,
+            attendance.department,
+            attendance.company,
+            attendance.in_time,
+            attendance.out_time,
+            attendance.late_entry,
+            attendance.early_exit,
+            shift_type.enable_late_entry_marking,
+            shift_type.late_entry_grace_period,
+            shift_type.enable_early_exit_marking,
+            shift_type.early_exit_grace_period,
+            employee.holiday_list,
+        )
+        .where((attendance.name.isin(attendance_names)) & (attendance.docstatus == 1))
+    ).run(as_dict=True)
+
+
+def build_facts(rows):
+    if not rows:
+        return []
+
+    company_holiday_lists = get_company_holiday_lists(d.company for d in rows if not d.holiday_list)
+    for d in rows:
+        d.holiday_list = d.holiday_list or company_holiday_lists.get(d.company)
+    holiday_calendar = get_holiday_calendar(d.holiday_list for d in rows)
+
+    dates = [d.attendance_date for d in rows]
+    resolver = ShiftResolver({d.employee for d in rows}, min(dates), max(dates), shift_types={d.shift for d in rows})
+    for d in rows:
+        shift = resolver.get_attendance_shift(d.employee, d.attendance_date, d.shift, d.in_time)
+        d.shift_start, d.shift_end = (shift.start, shift.end) if shift else (None, None)
+
+    # Facts store grace-adjusted late/early seconds, the raw timings are kept as epochs
+    settings = get_general_settings()
+    metrics = compute_row_metrics(
+        rows, 1, settings.late_in_grace_minutes, settings.early_out_grace_minutes
+    )
+    columns = {
+        key: [to_int(value) for value in metrics[key].tolist()]
+        for key in ("in_time", "out_time", "shift_start", "shift_end", "working_seconds", "late_seconds", "early_seconds")
+    }
+
+    return [
+        (
+            d.name,
+            d.employee,
+            d.employee_name,
+            d.attendance_date,
+            d.status,
+            get_day_type(holiday_calendar, d.holiday_list, d.attendance_date),
+            d.shift,
+            d.department,
+            d.company,
+            columns["in_time"][i],
+            columns["out_time"][i],
+            columns["shift_start"][i],
+            columns["shift_end"][i],
+            columns["working_seconds"][i],
+            columns["late_seconds"][i],
+            columns["early_seconds"][i],
+            d.late_entry or 0,
+            d.early_exit or 0,
+        )
+        for i, d in enumerate(rows)
+    ]
+
+
+def upsert_facts(facts):
+    if not facts:
+        return
+
+    timestamp, user = now(), frappe.session.user
+    columns = ("name", "creation", "modified", "modified_by", "owner", *FACT_FIELDS)
+    placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    updates = ", ".join(f"`{field}` = VALUES(`{field}`)" for field in ("modified", "modified_by", *FACT_FIELDS))
+
+    for batch in create_batch(facts, FACT_BATCH_SIZE):
+        values = []
+        for fact in batch:
+            values.extend((fact[0], timestamp, timestamp, user, user, *fact))
+
+        frappe.db.sql(
+            f"""
+            INSERT INTO `tab{FACT_DOCTYPE}` ({", ".join(f"`{column}`" for column in columns)})
+            VALUES {", ".join([placeholders] * len(batch))}
+            ON DUPLICATE KEY UPDATE {updates}
+            """,
+            values,
+        )
+
+
+def to_int(value):
+    return None if math.isnan(value) else int(value)
+
+
+# Doc events
+# ----------
+# Refreshes run in a background job after the triggering transaction commits, so the
+# checkins linked to a new attendance in the same transaction are visible to it.
+
+
+def on_attendance_change(doc, method=None):
+    queue_fact_refresh([doc.name])
+
+
+def on_general_settings_change(doc, method=None):
+    """Rebuild every fact when the active grace minutes differ from the ones they were built with."""
+    since = get_facts_since()
+    grace = get_grace_stamp(load_general_settings())
+    if not since or grace == frappe.db.get_default(FACTS_GRACE_KEY):
+        return
+
+    frappe.db.set_default(FACTS_GRACE_KEY, grace)
+    frappe.enqueue(
+        rebuild_attendance_facts,
+        queue="long",
+        timeout=4 * 60 * 60,
+        enqueue_after_commit=True,
+        from_date=since,
+        # leave is marked ahead
+        to_date=add_years(today(), 1),
+    )
+
+
+def get_grace_stamp(settings):
+    return f"{settings.late_in_grace_minutes}/{settings.early_out_grace_minutes}"
+
+
+def on_checkin_change(doc, method=None):
+    if doc.attendance:
+        queue_fact_refresh([doc.attendance])
+
+
+def on_holiday_list_update(doc, method=None):
+    frappe.enqueue(
+        refresh_holiday_list_facts,
+        queue="long",
+        enqueue_after_commit=True,
+        holiday_list=doc.name,
+        from_date=doc.from_date,
+        to_date=doc.to_date,
+    )
+
+
+def refresh_holiday_list_facts(holiday_list, from_date, to_date):
+    """Reclassify the facts of employees following a Holiday List within its period."""
+    companies = frappe.get_all("Company", filters={"default_holiday_list": holiday_list}, pluck="name")
+    employee = frappe.qb.DocType("Employee")
+    fact = frappe.qb.DocType(FACT_DOCTYPE)
+
+    follows_list = employee.holiday_list == holiday_list
+    if companies:
+        no_own_list = employee.holiday_list.isnull() | (employee.holiday_list == "")
+        follows_list |= no_own_list & fact.company.isin(companies)
+
+    names = (
+        frappe.qb.from_(fact)
+        .inner_join(employee).on(employee.name == fact.employee)
+        .select(fact.name)
+        .where(fact.attendance_date.between(getdate(from_date), getdate(to_date)) & follows_list)
+    ).run(pluck=True)
+
+    for batch in create_batch(names, FACT_BATCH_SIZE):
+        refresh_attendance_facts(batch)
+        frappe.db.commit()
+
+
+def queue_fact_refresh(attendance_names):
+    pending = frappe.flags.cw_hrms_pending_fact_refresh
+    if pending is None:
+        pending = frappe.flags.cw_hrms_pending_fact_refresh = set()
+        frappe.db.after_commit.add(enqueue_pending_fact_refresh)
+        frappe.db.after_rollback.add(clear_pending_fact_refresh)
+    pending.update(attendance_names)
+
+
+def enqueue_pending_fact_refresh():
+    pending = frappe.flags.cw_hrms_pending_fact_refresh
+    frappe.flags.cw_hrms_pending_fact_refresh = None
+    if pending:
+        frappe.enqueue(refresh_attendance_facts, queue="short", attendance_names=list(pending))
+
+
+def clear_pending_fact_refresh():
+    frappe.flags.cw_hrms_pending_fact_refresh = None
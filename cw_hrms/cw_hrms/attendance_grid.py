@@ -0,0 +1,118 @@
+# Copyright (c) 2026, Codeware Limited and contributors
+# For license information, please see license.txt
+
+from datetime import timedelta
+
+import frappe
+from frappe import _
+from frappe.utils import cint, date_diff, getdate
+
+from cw_hrms.cw_hrms.holiday_calendar import get_company_holiday_lists, get_holiday_calendar
+
+# Default, overridable from site_config
+MAX_GRID_CELLS = 2_000_000
+
+
+def get_calendar_gaps(filters, data):
+    """Return a row for every employee and date in the range without an attendance in `data`.
+
+    The employee x date grid covers employees in service during the range. Each employee's
+    days are kept as bitsets (bit i is from_date + i): attended days, days in service and,
+    per holiday list, weekends and holidays. The gaps of an employee are then a few integer
+    operations; rows are only built for the gap cells, as Unmarked, Weekend or Holiday.
+    """
+    if not (filters.get("from_date") and filters.get("to_date")):
+        return []
+
+    from_date, to_date = getdate(filters.from_date), getdate(filters.to_date)
+    days = date_diff(to_date, from_date) + 1
+    employees = get_grid_employees(filters, from_date, to_date)
+
+    max_cells = cint(frappe.conf.get("cw_hrms_max_calendar_grid_cells")) or MAX_GRID_CELLS
+    if days * len(employees) > max_cells:
+        frappe.throw(
+            _("Showing all days of {0} employees over {1} days is too large, please narrow the filters").format(
+                len(employees), days
+            )
+        )
+
+    attended = {}
+    for d in data:
+        idx = date_diff(d.attendance_date, from_date)
+        if 0 <= idx < days:
+            attended[d.employee] = attended.get(d.employee, 0) | (1 << idx)
+
+    company_holiday_lists = get_company_holiday_lists(e.company for e in employees if not e.holiday_list)
+    for e in employees:
+        e.holiday_list = e.holiday_list or company_holiday_lists.get(e.company)
+    calendar = get_holiday_calendar(e.holiday_list for e in employees)
+    masks = {h_list: get_holiday_masks(holidays, from_date, days) for h_list, holidays in calendar.items()}
+
+    statuses = {"Unmarked": _("Unmarked"), "Weekend": _("Weekend"), "Holiday": _("Holiday")}
+    gaps = []
+    for e in employees:
+        first = max(date_diff(e.date_of_joining, from_date), 0) if e.date_of_joining else 0
+        last = min(date_diff(e.relieving_date, from_date), days - 1) if e.relieving_date else days - 1
+        if first > last:
+            continue
+
+        in_service = ((1 << (last - first + 1)) - 1) << first
+        missing = in_service & ~attended.get(e.name, 0)
+        weekends, holidays = masks.get(e.holiday_list, (0, 0))
+
+        for status, cells in (
+            ("Unmarked", missing & ~(weekends | holidays)),
+            ("Weekend", missing & weekends),
+            ("Holiday", missing & holidays),
+        ):
+            for idx in iter_bits(cells):
+                gaps.append(
+                    frappe._dict(
+                        employee=e.name,
+                        employee_name=e.employee_name,
+                        department=e.department,
+                        company=e.company,
+                        attendance_date=from_date + timedelta(days=idx),
+                        status=statuses[status],
+                        is_weekend_or_holiday=0 if status == "Unmarked" else 1,
+                        working_hours_float=0.0,
+                    )
+                )
+
+    return gaps
+
+
+def get_grid_employees(filters, from_date, to_date):
+    employee_filters = {"date_of_joining": ["<=", to_date], "status": ["!=", "Inactive"]}
+    if filters.get("employee"):
+        employee_filters["name"] = filters.employee
+    if filters.get("company"):
+        employee_filters["company"] = filters.company
+
+    return frappe.get_all(
+        "Employee",
+        filters=employee_filters,
+        or_filters=[["relieving_date", "is", "not set"], ["relieving_date", ">=", from_date]],
+        fields=["name", "employee_name", "department", "company", "holiday_list", "date_of_joining", "relieving_date"],
+    )
+
+
+def get_holiday_masks(holidays, from_date, days):
+    """Return `(weekends, holidays)` bitsets of a holiday list over the range."""
+    weekends = other = 0
+    for date, weekly_off in holidays.items():
+        idx = date_diff(date, from_date)
+        if 0 <= idx < days:
+            if weekly_off:
+                weekends |= 1 << idx
+            else:
+                other |= 1 << idx
+    return weekends, other
+
+
+def iter_bits(value):
+    """Yield the indexes of the set bits, lowest first."""
+    while value:
+        lowest = value & -value
+        yield lowest.bit_length() - 1
+        value ^= lowest
@@ -0,0 +1,85 @@
+# Copyright (c) 2025, Codeware Limited and contributors
+# For license information, please see license.txt
+
+from datetime import datetime, timedelta
+
+import frappe
+import numpy as np
+from frappe.utils import cint
+
+# Naive epoch, so differences are not shifted by the server's timezone or DST
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch_seconds(values, count):
+    """Return a float64 array of seconds since EPOCH, NaN where a value is missing."""
+    return np.fromiter(
+        ((value - EPOCH).total_seconds() if value else np.nan for value in values),
+        dtype=np.float64,
+        count=count,
+    )
+
+
+def compute_attendance_metrics(in_time, out_time, shift_start, shift_end, late_grace, early_grace):
+    """Compute working, late and early seconds for every row in one pass.
+
+    All arguments are equal length float arrays; timestamps are epoch seconds with
+    NaN for missing values and grace periods are in minutes. Late and early seconds
+    are 0 where the row is on time or lacks the timestamps to tell.
+    """
+    with np.errstate(invalid="ignore"):
+        working_seconds = np.nan_to_num(out_time - in_time, nan=0.0)
+        late_by = in_time - (shift_start + late_grace * 60)
+        early_by = (shift_end - early_grace * 60) - out_time
+
+        late_entry = late_by > 0
+        early_exit = early_by > 0
+
+    return frappe._dict(
+        working_seconds=working_seconds,
+        late_seconds=np.where(late_entry, late_by, 0.0),
+        early_seconds=np.where(early_exit, early_by, 0.0),
+        late_entry=late_entry,
+        early_exit=early_exit,
+        # rows that have both timestamps the comparison needs
+        has_late_window=~np.isnan(late_by),
+        has_early_window=~np.isnan(early_by),
+    )
+
+
+def compute_row_metrics(rows, consider_grace_period, default_late_grace=0, default_early_grace=0):
+    """Build the kernel's columnar inputs from report rows and run it.
+
+    The epoch arrays are returned along with the metrics. Grace periods only apply with
+    `consider_grace_period`; rows whose Shift Type does not enable marking use the defaults.
+    """
+    count = len(rows)
+    in_time = to_epoch_seconds((d.in_time for d in rows), count)
+    out_time = to_epoch_seconds((d.out_time for d in rows), count)
+    shift_start = to_epoch_seconds((d.shift_start for d in rows), count)
+    shift_end = to_epoch_seconds((d.shift_end for d in rows), count)
+
+    if consider_grace_period:
+        late_grace = np.fromiter(
+            (cint(d.late_entry_grace_period) if d.enable_late_entry_marking else default_late_grace for d in rows),
+            dtype=np.float64,
+            count=count,
+        )
+        early_grace = np.fromiter(
+            (cint(d.early_exit_grace_period) if d.enable_early_exit_marking else default_early_grace for d in rows),
+            dtype=np.float64,
+            count=count,
+        )
+    else:
+        late_grace = early_grace = np.zeros(count)
+
+    metrics = compute_attendance_metrics(in_time, out_time, shift_start, shift_end, late_grace, early_grace)
+    metrics.update(in_time=in_time, out_time=out_time, shift_start=shift_start, shift_end=shift_end)
+    return metrics
+
+
+def from_epoch_seconds(value):
+    """Return the naive datetime for epoch seconds, None for a missing value."""
+    if value is None:
+        return None
+    return EPOCH + timedelta(seconds=value)
@@ -0,0 +1,379 @@
+# Copyright (c) 2026, Codeware Limited and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.utils import add_days, add_months, cint, flt, get_first_day, get_last_day, getdate, now, today
+
+from cw_hrms.cw_hrms.attendance_fact import facts_cover
+from cw_hrms.cw_hrms_settings.doctype.general_settings.general_settings import get_general_settings
+
+ROLLUP_DOCTYPE = "Attendance Monthly Rollup"
+# Roll-ups are complete for the months in [since, until)
+ROLLUP_SINCE_KEY = "cw_hrms_attendance_rollup_since"
+ROLLUP_UNTIL_KEY = "cw_hrms_attendance_rollup_until"
+
+ROLLUP_GROUP_FIELDS = ("employee", "company", "department", "shift", "month")
+COUNTERS = (
+    "total",
+    "holidays",
+    "present",
+    "absent",
+    "half_day",
+    "on_leave",
+    "working_seconds",
+    "present_records",
+    "absent_records",
+    "leave_records",
+    "late_entry_records",
+    "late",
+    "early",
+    "late_no_grace",
+    "early_no_grace",
+)
+MONTH_EXPRESSION = "DATE_SUB(a.attendance_date, INTERVAL DAYOFMONTH(a.attendance_date) - 1 DAY)"
+
+
+def get_attendance_counters(filters, group_by=()):
+    """Return attendance counters over the filters' range, one `_dict` per `group_by` combination.
+
+    Closed months covered by roll-ups are read from them; only the rest of the range, in
+    practice the open month and partial months at the edges, is scanned. Each entry has the
+    COUNTERS plus "rows", the number of attendance records; "late" and "early" follow the
+    consider_grace_period filter. Working-day counters, "total", "late" and "early" only count
+    days up to today; the "*_records" counters count every record as stored.
+    """
+    frozen, live = split_range(filters.get("from_date"), filters.get("to_date"))
+    counters = get_rollup_counters(filters, group_by, *frozen) if frozen else []
+    for from_date, to_date in live:
+        counters += scan_counters(frappe._dict(filters, from_date=from_date, to_date=to_date), group_by)
+
+    merged = {}
+    for row in counters:
+        entry = merged.setdefault(
+            tuple(row[field] for field in group_by),
+            frappe._dict({field: row[field] for field in group_by}, rows=0, **dict.fromkeys(COUNTERS, 0)),
+        )
+        entry.rows += cint(row.rows)
+        for counter in COUNTERS:
+            entry[counter] += flt(row[counter]) if counter == "working_seconds" else cint(row[counter])
+
+    if not cint(filters.get("consider_grace_period")):
+        for entry in merged.values():
+            entry.late, entry.early = entry.late_no_grace, entry.early_no_grace
+    return list(merged.values())
+
+
+def split_range(from_date, to_date):
+    """Split a date range into `(first_month, last_month)` of whole rolled-up months and the live rest.
+
+    Returns `(None, [(from_date, to_date)])` when no whole month of the range is rolled up.
+    """
+    since, until = get_rollup_coverage()
+    if not (since and from_date and to_date):
+        return None, [(from_date, to_date)]
+
+    from_date, to_date = getdate(from_date), getdate(to_date)
+    first = get_first_day(from_date)
+    if first < from_date:
+        first = add_months(first, 1)
+    first = max(first, since)
+    # first day of the month after the last whole month in the range
+    end = min(get_first_day(add_days(to_date, 1)), until)
+    if first >= end:
+        return None, [(from_date, to_date)]
+
+    live = []
+    if from_date < first:
+        live.append((from_date, add_days(first, -1)))
+    if end <= to_date:
+        live.append((end, to_date))
+    return (first, add_months(end, -1)), live
+
+
+def get_rollup_counters(filters, group_by, first_month, last_month):
+    conditions, values = get_conditions(filters, "a")
+    conditions.append("a.month BETWEEN %(first_month)s AND %(last_month)s")
+    values.update(first_month=first_month, last_month=last_month)
+
+    return frappe.db.sql(
+        f"""
+        SELECT
+            {"".join(f"a.{field}, " for field in group_by)}
+            SUM(a.total) AS `rows`,
+            {", ".join(f"SUM(a.{counter}) AS {counter}" for counter in COUNTERS)}
+        FROM `tab{ROLLUP_DOCTYPE}` a
+        WHERE {" AND ".join(conditions)}
+        {get_group_by(group_by, {})}
+        """,
+        values,
+        as_dict=True,
+    )
+
+
+def scan_counters(filters, group_by, use_facts=None):
+    """Aggregate the counters from daily rows in one GROUP BY query.
+
+    The fact table is used when it covers the range, unless `use_facts` says otherwise;
+    it already has the day type and grace-adjusted late/early seconds. Without it, attendance
+    with no shift is only late or early by its own flags, there is no first-punch shift lookup.
+    """
+    settings = get_general_settings()
+    conditions, values = get_conditions(filters, "a")
+    if filters.get("from_date"):
+        conditions.append("a.attendance_date >= %(from_date)s")
+        values["from_date"] = getdate(filters.from_date)
+    if filters.get("to_date"):
+        conditions.append("a.attendance_date <= %(to_date)s")
+        values["to_date"] = getdate(filters.to_date)
+    values.update(
+        today=getdate(today()),
+        late_grace=settings.late_in_grace_minutes,
+        early_grace=settings.early_out_grace_minutes,
+    )
+
+    if facts_cover(filters.get("from_date")) if use_facts is None else use_facts:
+        source = "`tabAttendance Daily Fact` a"
+        is_holiday = "COALESCE(a.day_type IN ('Weekend', 'Holiday'), 0)"
+        working_seconds = "COALESCE(a.working_seconds, 0)"
+        late = "a.late_entry = 1 OR a.late_seconds > 0"
+        early = "a.early_exit = 1 OR a.early_seconds > 0"
+        late_no_grace = "a.late_entry = 1 OR a.in_epoch > a.shift_start_epoch"
+        early_no_grace = "a.early_exit = 1 OR a.out_epoch < a.shift_end_epoch"
+    else:
+        conditions.append("a.docstatus = 1")
+        source = """`tabAttendance` a
+            LEFT JOIN `tabShift Type` st ON st.name = a.shift
+            LEFT JOIN `tabEmployee` e ON e.name = a.employee
+            LEFT JOIN `tabCompany` c ON c.name = a.company"""
+        # The employee's holiday list, else the company's default list
+        is_holiday = """EXISTS (
+            SELECT 1 FROM `tabHoliday` h
+            WHERE h.parent = COALESCE(NULLIF(e.holiday_list, ''), c.default_holiday_list)
+            AND h.holiday_date = a.attendance_date
+        )"""
+        working_seconds = "COALESCE(TIMESTAMPDIFF(SECOND, a.in_time, a.out_time), 0)"
+        late_grace = "IF(st.enable_late_entry_marking = 1, COALESCE(st.late_entry_grace_period, 0), %(late_grace)s)"
+        early_grace = "IF(st.enable_early_exit_marking = 1, COALESCE(st.early_exit_grace_period, 0), %(early_grace)s)"
+        # Like ShiftResolver: the attendance's shift on its date, overnight shifts end the next day
+        shift_start = "TIMESTAMP(a.attendance_date, st.start_time)"
+        shift_end = "TIMESTAMP(a.attendance_date + INTERVAL IF(st.end_time <= st.start_time, 1, 0) DAY, st.end_time)"
+        late = f"a.late_entry = 1 OR a.in_time > {shift_start} + INTERVAL ({late_grace}) MINUTE"
+        early = f"a.early_exit = 1 OR a.out_time < {shift_end} - INTERVAL ({early_grace}) MINUTE"
+        late_no_grace = f"a.late_entry = 1 OR a.in_time > {shift_start}"
+        early_no_grace = f"a.early_exit = 1 OR a.out_time < {shift_end}"
+
+    counted = "a.attendance_date <= %(today)s"
+    working_day = f"{counted} AND NOT ({is_holiday})"
+    expressions = {"month": MONTH_EXPRESSION}
+    return frappe.db.sql(
+        f"""
+        SELECT
+            {"".join(f"{expressions.get(field, f'a.{field}')} AS {field}, " for field in group_by)}
+            MAX(a.employee_name) AS employee_name,
+            COUNT(*) AS `rows`,
+            SUM({counted}) AS total,
+            SUM({counted} AND ({is_holiday})) AS holidays,
+            SUM({working_day} AND a.status = 'Present') AS present,
+            SUM({working_day} AND a.status = 'Absent') AS absent,
+            SUM({working_day} AND a.status = 'Half Day') AS half_day,
+            SUM({working_day} AND a.status = 'On Leave') AS on_leave,
+            SUM(IF({working_day}, {working_seconds}, 0)) AS working_seconds,
+            SUM(a.status = 'Present') AS present_records,
+            SUM(a.status = 'Absent') AS absent_records,
+            SUM(a.status = 'On Leave') AS leave_records,
+            SUM(a.late_entry = 1) AS late_entry_records,
+            SUM({counted} AND ({late})) AS late,
+            SUM({counted} AND ({early})) AS early,
+            SUM({counted} AND ({late_no_grace})) AS late_no_grace,
+            SUM({counted} AND ({early_no_grace})) AS early_no_grace
+        FROM {source}
+        WHERE {" AND ".join(conditions) or "1 = 1"}
+        {get_group_by(group_by, expressions)}
+        """,
+        values,
+        as_dict=True,
+    )
+
+
+def get_conditions(filters, alias):
+    """Conditions on the employee, department and company filters, shared by both tables."""
+    conditions, values = [], {}
+    for field in ("employee", "department", "company"):
+        if filters.get(field):
+            conditions.append(f"{alias}.{field} = %({field})s")
+            values[field] = filters.get(field)
+    if filters.get("employees"):
+        conditions.append(f"{alias}.employee IN %(employees)s")
+        values["employees"] = tuple(filters.employees)
+    return conditions, values
+
+
+def get_group_by(group_by, expressions):
+    if not group_by:
+        return ""
+    return "GROUP BY " + ", ".join(expressions.get(field, f"a.{field}") for field in group_by)
+
+
+def get_rollup_coverage():
+    """Return `(since, until)`: roll-ups are complete for the months from since up to, not including, until."""
+    since, until = frappe.db.get_default(ROLLUP_SINCE_KEY), frappe.db.get_default(ROLLUP_UNTIL_KEY)
+    if not (since and until):
+        return None, None
+    return getdate(since), getdate(until)
+
+
+def rollups_cover(date):
+    since, until = get_rollup_coverage()
+    return bool(since and date and since <= get_first_day(date) < until)
+
+
+def finalize_monthly_rollups():
+    """Roll up every closed month since the last run; scheduled at the start of each month."""
+    _since, until = get_rollup_coverage()
+    last_closed = add_months(get_first_day(today()), -1)
+    rebuild_monthly_rollups(until or last_closed, last_closed)
+
+
+def rebuild_monthly_rollups(from_date, to_date):
+    """(Re)build the roll-ups of the closed months in a range, committing after every month."""
+    first = get_first_day(from_date)
+    last = min(get_first_day(to_date), add_months(get_first_day(today()), -1))
+    if first > last:
+        return
+
+    month = first
+    while month <= last:
+        build_month_rollups(month)
+        frappe.db.commit()
+        month = add_months(month, 1)
+
+    # Coverage only extends when the rebuilt months join up with the rolled-up ones
+    since, until = get_rollup_coverage()
+    if not since:
+        since, until = first, add_months(last, 1)
+    elif first <= until and add_months(last, 1) >= since:
+        since, until = min(since, first), max(until, add_months(last, 1))
+    else:
+        return
+    frappe.db.set_default(ROLLUP_SINCE_KEY, str(since))
+    frappe.db.set_default(ROLLUP_UNTIL_KEY, str(until))
+    frappe.db.commit()
+
+
+@frappe.whitelist()
+def enqueue_rebuild_monthly_rollups(from_date, to_date):
+    frappe.only_for("System Manager")
+    frappe.enqueue(
+        rebuild_monthly_rollups,
+        queue="long",
+        timeout=4 * 60 * 60,
+        from_date=from_date,
+        to_date=to_date,
+    )
+
+
+def build_month_rollups(month, employees=None):
+    """Replace the roll-ups of a month, of only the given employees when passed.
+
+    Counted from Attendance rather than the fact table, whose refresh may still be queued.
+    """
+    month = get_first_day(month)
+    filters = frappe._dict(from_date=month, to_date=get_last_day(month), employees=employees)
+    rows = scan_counters(filters, ROLLUP_GROUP_FIELDS, use_facts=False)
+
+    delete_filters = {"month": month}
+    if employees:
+        delete_filters["employee"] = ("in", list(employees))
+    frappe.db.delete(ROLLUP_DOCTYPE, delete_filters)
+
+    timestamp, user = now(), frappe.session.user
+    fields = ("name", "creation", "modified", "modified_by", "owner", *ROLLUP_GROUP_FIELDS, "employee_name", *COUNTERS)
+    frappe.db.bulk_insert(
+        ROLLUP_DOCTYPE,
+        fields,
+        [
+            (
+                frappe.generate_hash(length=10),
+                timestamp,
+                timestamp,
+                user,
+                user,
+                *(row[field] for field in ROLLUP_GROUP_FIELDS),
+                row.employee_name,
+                *(flt(row[counter]) if counter == "working_seconds" else cint(row[counter]) for counter in COUNTERS),
+            )
+            for row in rows
+        ],
+    )
+
+
+# Doc events
+# ----------
+# Closed months can still change through amended, late or bulk-written attendance; their
+# roll-ups are rebuilt per employee in a background job after the transaction commits.
+#
+# Roll-ups count attendance as stored, with the department and shift on the attendance
+# itself, so Employee and Shift Assignment changes do not affect them. Changes to a Shift
+# Type's timings or grace, or to the default grace in General Settings, are not applied to
+# frozen months: run `bench rebuild-attendance-rollups` over the months they should cover.
+
+
+def on_attendance_change(doc, method=None):
+    queue_attendance_rollup_refresh([doc])
+
+
+def queue_attendance_rollup_refresh(rows):
+    """Queue a refresh of the rolled-up months of attendance rows (employee, attendance_date)."""
+    since, until = get_rollup_coverage()
+    if not since:
+        return
+
+    keys = set()
+    for row in rows:
+        month = get_first_day(row.attendance_date)
+        if since <= month < until:
+            keys.add((row.employee, str(month)))
+    if keys:
+        queue_rollup_refresh(keys)
+
+
+def on_holiday_list_update(doc, method=None):
+    since, until = get_rollup_coverage()
+    if not since or getdate(doc.from_date) >= until or getdate(doc.to_date) < since:
+        return
+    frappe.enqueue(
+        rebuild_monthly_rollups,
+        queue="long",
+        enqueue_after_commit=True,
+        from_date=max(getdate(doc.from_date), since),
+        to_date=min(getdate(doc.to_date), add_days(until, -1)),
+    )
+
+
+def refresh_monthly_rollups(keys):
+    employees_by_month = {}
+    for employee, month in keys:
+        employees_by_month.setdefault(month, set()).add(employee)
+    for month, employees in employees_by_month.items():
+        build_month_rollups(month, list(employees))
+        frappe.db.commit()
+
+
+def queue_rollup_refresh(keys):
+    pending = frappe.flags.cw_hrms_pending_rollup_refresh
+    if pending is None:
+        pending = frappe.flags.cw_hrms_pending_rollup_refresh = set()
+        frappe.db.after_commit.add(enqueue_pending_rollup_refresh)
+        frappe.db.after_rollback.add(clear_pending_rollup_refresh)
+    pending.update(keys)
+
+
+def enqueue_pending_rollup_refresh():
+    pending = frappe.flags.cw_hrms_pending_rollup_refresh
+    frappe.flags.cw_hrms_pending_rollup_refresh = None
+    if pending:
+        frappe.enqueue(refresh_monthly_rollups, queue="short", keys=list(pending))
+
+
+def clear_pending_rollup_refresh():
+    frappe.flags.cw_hrms_pending_rollup_refresh = None
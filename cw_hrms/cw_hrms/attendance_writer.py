@@ -0,0 +1,288 @@
+# Copyright (c) 2026, Codeware Limited and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.utils import cint, create_batch, flt, getdate, now, today
+
+from cw_hrms.cw_hrms.api import clear_employee_dashboard_cache
+from cw_hrms.cw_hrms.attendance_fact import refresh_attendance_facts
+from cw_hrms.cw_hrms.attendance_rollup import queue_attendance_rollup_refresh
+from cw_hrms.cw_hrms.naming import reserve_series_names
+
+ATTENDANCE_STATUSES = ("Present", "Absent", "On Leave", "Half Day", "Work From Home")
+ATTENDANCE_FIELDS = (
+    "employee",
+    "employee_name",
+    "attendance_date",
+    "status",
+    "company",
+    "department",
+    "shift",
+    "leave_type",
+    "leave_application",
+    "in_time",
+    "out_time",
+    "working_hours",
+    "late_entry",
+    "early_exit",
+)
+BULK_CHUNK_SIZE = 500
+
+
+def bulk_insert_attendance(rows, chunk_size=BULK_CHUNK_SIZE):
+    """Validate and insert submitted Attendance in multi-row INSERTs, one transaction per chunk.
+
+    Each row is a dict of Attendance fields (employee, attendance_date and status are required)
+    and may carry `checkins`, the Employee Checkin names to link to the new attendance.
+    Invalid rows and rows of a chunk that fails to insert are reported instead of aborting the
+    batch: returns `{"inserted": [names], "failed": [{"idx", "employee", "attendance_date", "error"}]}`.
+    """
+    rows = [frappe._dict(row) for row in rows]
+    for idx, row in enumerate(rows):
+        row.idx = idx
+
+    valid, failed = validate_rows(rows)
+    inserted = []
+
+    for chunk in create_batch(valid, chunk_size):
+        frappe.db.savepoint("cw_hrms_bulk_attendance")
+        try:
+            inserted.extend(insert_chunk(chunk))
+        except Exception:
+            frappe.db.rollback(save_point="cw_hrms_bulk_attendance")
+            # Retry the rows one by one so a single bad row does not sink its chunk
+            for row in chunk:
+                frappe.db.savepoint("cw_hrms_bulk_attendance")
+                try:
+                    inserted.extend(insert_chunk([row]))
+                except Exception as e:
+                    frappe.db.rollback(save_point="cw_hrms_bulk_attendance")
+                    failed.append(get_failure(row, str(e)))
+        frappe.db.commit()
+
+    return {"inserted": inserted, "failed": sorted(failed, key=lambda f: f["idx"])}
+
+
+@frappe.whitelist()
+def bulk_mark_attendance(rows):
+    frappe.only_for(["HR Manager", "System Manager"])
+    return bulk_insert_attendance(frappe.parse_json(rows))
+
+
+def validate_rows(rows):
+    """Check rows against employees, existing attendance and approved leaves, each loaded in one query."""
+    employees = get_employee_details({row.employee for row in rows if row.employee})
+    existing = get_existing_attendance(rows)
+    leaves = get_leave_records(rows)
+    max_date = getdate(today())
+    valid, failed = [], []
+
+    for row in rows:
+        error = None
+        employee = employees.get(row.employee)
+        attendance_date = getdate(row.attendance_date) if row.attendance_date else None
+
+        if not (row.employee and attendance_date and row.status):
+            error = _("Employee, Attendance Date and Status are mandatory")
+        elif row.status not in ATTENDANCE_STATUSES:
+            error = _("Invalid status {0}").format(row.status)
+        elif not employee:
+            error = _("Employee {0} not found").format(row.employee)
+        elif employee.status == "Inactive":
+            error = _("Employee {0} is not active").format(row.employee)
+        elif attendance_date > max_date and row.status not in ("On Leave", "Half Day"):
+            error = _("Attendance can not be marked for future dates")
+        elif employee.date_of_joining and attendance_date < employee.date_of_joining:
+            error = _("Attendance date can not be less than employee's joining date")
+        elif employee.relieving_date and attendance_date > employee.relieving_date:
+            error = _("Attendance date can not be after employee's relieving date")
+        elif is_duplicate(existing, row.employee, attendance_date, row.shift):
+            error = _("Attendance for employee {0} is already marked for the date {1}").format(
+                row.employee, attendance_date
+            )
+
+        if error:
+            failed.append(get_failure(row, error))
+            continue
+
+        existing.setdefault((row.employee, attendance_date), set()).add(row.shift)
+        row.attendance_date = attendance_date
+        apply_leave_record(row, leaves.get(row.employee, []))
+        row.employee_name = row.employee_name or employee.employee_name
+        row.company = row.company or employee.company
+        row.department = row.department or employee.department
+        valid.append(row)
+
+    return valid, failed
+
+
+def insert_chunk(rows):
+    naming_series = get_attendance_naming_series()
+    names = reserve_series_names(naming_series, len(rows))
+    timestamp, user = now(), frappe.session.user
+
+    values = []
+    for name, row in zip(names, rows):
+        row.name = name
+        values.append(
+            (
+                name,
+                timestamp,
+                timestamp,
+                user,
+                user,
+                1,
+                naming_series,
+                row.employee,
+                row.employee_name,
+                row.attendance_date,
+                row.status,
+                row.company,
+                row.department,
+                row.shift,
+                row.leave_type,
+                row.leave_application,
+                row.in_time,
+                row.out_time,
+                flt(row.working_hours),
+                cint(row.late_entry),
+                cint(row.early_exit),
+            )
+        )
+
+    frappe.db.bulk_insert(
+        "Attendance",
+        ("name", "creation", "modified", "modified_by", "owner", "docstatus", "naming_series", *ATTENDANCE_FIELDS),
+        values,
+    )
+
+    run_post_submit_effects(rows)
+    return names
+
+
+def run_post_submit_effects(rows):
+    """The side effects of submitting Attendance that cw_hrms relies on."""
+    link_checkins(rows)
+    refresh_attendance_facts([row.name for row in rows])
+    queue_attendance_rollup_refresh(rows)
+    clear_employee_dashboard_cache(employees=[row.employee for row in rows])
+
+
+def link_checkins(rows):
+    links = [(checkin, row.name) for row in rows for checkin in row.get("checkins") or []]
+    for batch in create_batch(links, BULK_CHUNK_SIZE):
+        cases = " ".join(["WHEN %s THEN %s"] * len(batch))
+        values = [value for link in batch for value in link]
+        values.extend(checkin for checkin, _attendance in batch)
+        frappe.db.sql(
+            f"""
+            UPDATE `tabEmployee Checkin`
+            SET `attendance` = CASE `name` {cases} END
+            WHERE `name` IN ({", ".join(["%s"] * len(batch))})
+            """,
+            values,
+        )
+
+
+def get_employee_details(employees):
+    if not employees:
+        return {}
+
+    return {
+        employee.name: employee
+        for employee in frappe.get_all(
+            "Employee",
+            filters={"name": ["in", list(employees)]},
+            fields=[
+                "name",
+                "employee_name",
+                "company",
+                "department",
+                "status",
+                "date_of_joining",
+                "relieving_date",
+            ],
+        )
+    }
+
+
+def get_existing_attendance(rows):
+    dates = [getdate(row.attendance_date) for row in rows if row.attendance_date]
+    employees = list({row.employee for row in rows if row.employee})
+    if not (dates and employees):
+        return {}
+
+    existing = frappe.get_all(
+        "Attendance",
+        filters={
+            "employee": ["in", employees],
+            "attendance_date": ["between", [min(dates), max(dates)]],
+            "docstatus": ["!=", 2],
+        },
+        fields=["employee", "attendance_date", "shift"],
+    )
+    shifts_by_day = {}
+    for d in existing:
+        shifts_by_day.setdefault((d.employee, d.attendance_date), set()).add(d.shift)
+    return shifts_by_day
+
+
+def get_leave_records(rows):
+    dates = [getdate(row.attendance_date) for row in rows if row.attendance_date]
+    employees = list({row.employee for row in rows if row.employee})
+    if not (dates and employees):
+        return {}
+
+    leave_records = frappe.get_all(
+        "Leave Application",
+        filters={
+            "employee": ["in", employees],
+            "from_date": ["<=", max(dates)],
+            "to_date": [">=", min(dates)],
+            "status": "Approved",
+            "docstatus": 1,
+        },
+        fields=["name", "employee", "leave_type", "from_date", "to_date", "half_day_date"],
+        order_by="from_date",
+    )
+    by_employee = {}
+    for d in leave_records:
+        by_employee.setdefault(d.employee, []).append(d)
+    return by_employee
+
+
+def apply_leave_record(row, leave_records):
+    """Same rule as HRMS Attendance.check_leave_record: a day under an approved leave is On Leave,
+    or Half Day on its half day date, and other days do not keep a leave type.
+    """
+    for d in leave_records:
+        if d.from_date <= row.attendance_date <= d.to_date:
+            row.leave_type = d.leave_type
+            row.leave_application = d.name
+            row.status = "Half Day" if d.half_day_date == row.attendance_date else "On Leave"
+
+    if row.status not in ("On Leave", "Half Day") and row.leave_type:
+        row.leave_type = None
+        row.leave_application = None
+
+
+def is_duplicate(existing, employee, attendance_date, shift):
+    """Attendance without a shift clashes with any other attendance of the day, otherwise only the same shift does."""
+    shifts = existing.get((employee, attendance_date))
+    if not shifts:
+        return False
+    return not shift or None in shifts or shift in shifts
+
+
+def get_attendance_naming_series():
+    return (frappe.get_meta("Attendance").get_field("naming_series").options or "HR-ATT-.YYYY.-").split("\n")[0]
+
+
+def get_failure(row, error):
+    return {
+        "idx": row.idx,
+        "employee": row.employee,
+        "attendance_date": row.attendance_date,
+        "error": error,
+    }
@@ -0,0 +1,400 @@
+# Copyright (c) 2026, Codeware Limited and contributors
+# For license information, please see license.txt
+
+import hashlib
+from datetime import datetime, timedelta
+from itertools import groupby
+
+import frappe
+from frappe.utils import cint, create_batch, flt, get_datetime, get_time, getdate, now, now_datetime
+
+from cw_hrms.cw_hrms.attendance_writer import bulk_insert_attendance
+from cw_hrms.cw_hrms.holiday_calendar import get_employee_holiday_lists, get_holiday, get_holiday_calendar
+from cw_hrms.cw_hrms.shift_resolver import ShiftResolver
+from cw_hrms.cw_hrms_settings.doctype.general_settings.general_settings import get_general_settings
+
+CHECKPOINT_KEY = "cw_hrms:auto_attendance:checkpoint"
+CHECKPOINT_TTL = 7 * 24 * 60 * 60
+# Released when a run ends; only expires on its own when a worker dies holding it
+ATTENDANCE_LOCK_TIMEOUT = 2 * 60 * 60
+
+# Defaults, overridable from site_config
+EMPLOYEE_CHUNK_SIZE = 250
+ATTENDANCE_BATCH_SIZE = 500
+
+
+def enqueue_auto_attendance(shift_type):
+    """Split the employees of a shift into chunks and mark their attendance in background workers.
+
+    Returns the number of chunks queued.
+    """
+    if not (
+        cint(shift_type.enable_auto_attendance)
+        and shift_type.process_attendance_after
+        and shift_type.last_sync_of_checkin
+    ):
+        return 0
+
+    employees = set(shift_type.get_assigned_employees(shift_type.process_attendance_after, True))
+    employees.update(get_employees_with_pending_checkins(shift_type))
+
+    chunk_size = cint(frappe.conf.get("cw_hrms_auto_attendance_chunk_size")) or EMPLOYEE_CHUNK_SIZE
+    chunks = list(create_batch(sorted(employees), chunk_size))
+    for chunk in chunks:
+        chunk_key = get_chunk_key(shift_type, chunk)
+        frappe.enqueue(
+            process_attendance_chunk,
+            queue="long",
+            timeout=3600,
+            job_id=f"cw_hrms::auto_attendance::{chunk_key}",
+            deduplicate=True,
+            shift_type=shift_type.name,
+            employees=chunk,
+            chunk_key=chunk_key,
+        )
+
+    return len(chunks)
+
+
+def process_attendance_chunk(shift_type, employees, chunk_key):
+    """Mark attendance from unlinked checkins and absences for a chunk of a shift's employees.
+
+    A chunk is keyed on the shift, its last checkin sync and its employees, so a retried or
+    duplicated job for the same sync is skipped once the chunk has completed. Chunks of a
+    shift run one at a time, also with the incremental runs of that shift.
+    """
+    cache = frappe.cache()
+    if cache.hget(CHECKPOINT_KEY, chunk_key):
+        return
+
+    # waits for the shift's other chunks and incremental runs, see get_attendance_lock
+    with get_attendance_lock(shift_type):
+        frappe.db.commit()
+        if cache.hget(CHECKPOINT_KEY, chunk_key):
+            return
+
+        shift_type = frappe.get_doc("Shift Type", shift_type)
+        logs = get_pending_checkins(shift_type, employees)
+        mark_attendance_from_logs(shift_type, logs)
+
+        mark_absent_for_dates_with_no_attendance(shift_type, employees)
+        frappe.db.commit()
+
+    cache.hset(CHECKPOINT_KEY, chunk_key, now())
+    cache.expire(cache.make_key(CHECKPOINT_KEY), CHECKPOINT_TTL)
+
+
+def mark_attendance_from_logs(shift_type, logs):
+    """Mark one attendance per employee and shift occurrence through the bulk attendance writer."""
+
+    def group_key(log):
+        return (log.employee, log.shift_start)
+
+    groups = [(key, list(group)) for key, group in groupby(sorted(logs, key=group_key), key=group_key)]
+    if not groups:
+        return
+
+    # Holidays are resolved from preloaded calendars instead of a lookup per employee-day
+    mark_on_holidays = cint(shift_type.mark_auto_attendance_on_holidays)
+    if shift_type.holiday_list:
+        holiday_lists = {employee: shift_type.holiday_list for (employee, _shift_start), _logs in groups}
+    else:
+        holiday_lists = get_employee_holiday_lists(employee for (employee, _shift_start), _logs in groups)
+    holiday_calendar = get_holiday_calendar(holiday_lists.values())
+
+    # Company-wide minimum work hours apply to shifts without their own absent threshold
+    minimum_work_hours = 0
+    if not flt(shift_type.working_hours_threshold_for_absent):
+        minimum_work_hours = get_general_settings().minimum_work_hours
+
+    rows = []
+    for (employee, shift_start), single_shift_logs in groups:
+        attendance_date = shift_start.date()
+        if not mark_on_holidays and get_holiday(holiday_calendar, holiday_lists.get(employee), attendance_date) is not None:
+            continue
+
+        (
+            attendance_status,
+            working_hours,
+            late_entry,
+            early_exit,
+            in_time,
+            out_time,
+        ) = shift_type.get_attendance(single_shift_logs)
+
+        if minimum_work_hours and attendance_status == "Present" and working_hours < minimum_work_hours:
+            attendance_status = "Absent"
+
+        rows.append(
+            {
+                "employee": employee,
+                "attendance_date": attendance_date,
+                "status": attendance_status,
+                "shift": shift_type.name,
+                "working_hours": working_hours,
+                "late_entry": late_entry,
+                "early_exit": early_exit,
+                "in_time": in_time,
+                "out_time": out_time,
+                "checkins": [log.name for log in single_shift_logs],
+            }
+        )
+
+    # Existing attendance is reported back as a failed row, which is expected on re-runs
+    result = bulk_insert_attendance(rows, chunk_size=get_attendance_batch_size())
+    for failure in result["failed"]:
+        frappe.logger("cw_hrms").info(f"Auto attendance skipped for {failure['employee']}: {failure['error']}")
+
+
+def mark_absent_for_dates_with_no_attendance(shift_type, employees):
+    """Mark Absent on the shift's working days without attendance, for many employees at once.
+
+    Follows Shift Type's method of the same name, which does a shift lookup per employee
+    and date: dates run from `process_attendance_after` (or joining) up to the employee's
+    last occurrence of this shift starting a day before the last checkin sync. Shift
+    occurrences come from one ShiftResolver, so holidays and days on another shift drop out.
+    """
+    details = frappe.get_all(
+        "Employee",
+        filters={"name": ["in", employees]},
+        fields=["name", "date_of_joining", "relieving_date", "creation"],
+    )
+    if not details:
+        return
+
+    process_after = getdate(shift_type.process_attendance_after)
+    start_dates = {
+        d.name: max(process_after, getdate(d.date_of_joining or d.creation)) for d in details
+    }
+    processed_until = get_processed_until(shift_type)
+    resolver = ShiftResolver(employees, min(start_dates.values()), processed_until.date())
+
+    # HRMS waits a day after a shift before marking it absent, for manual attendance
+    last_shift_time = datetime.combine(processed_until.date(), get_time(shift_type.start_time))
+    last_shift_time -= timedelta(minutes=cint(shift_type.begin_check_in_before_shift_start_time))
+
+    end_dates = {}
+    for d in details:
+        previous = resolver.get_shift(d.name, last_shift_time - timedelta(days=1), "reverse")
+        if previous and previous.shift_type == shift_type.name:
+            end_dates[d.name] = min(previous.start.date(), getdate(d.relieving_date or previous.start.date()))
+    if not end_dates:
+        return
+
+    marked = get_marked_attendance_dates(
+        shift_type.name, list(end_dates), min(start_dates[e] for e in end_dates), max(end_dates.values())
+    )
+
+    rows = []
+    for employee, end_date in end_dates.items():
+        date = start_dates[employee]
+        while date <= end_date:
+            shift = resolver.get_shift_for_date(employee, date, shift_type.name)
+            if shift and (employee, date) not in marked:
+                rows.append(
+                    {"employee": employee, "attendance_date": date, "status": "Absent", "shift": shift_type.name}
+                )
+            date += timedelta(days=1)
+
+    bulk_insert_attendance(rows, chunk_size=get_attendance_batch_size())
+
+
+def get_marked_attendance_dates(shift_type, employees, from_date, to_date):
+    attendance = frappe.qb.DocType("Attendance")
+    return set(
+        (
+            frappe.qb.from_(attendance)
+            .select(attendance.employee, attendance.attendance_date)
+            .where(
+                attendance.employee.isin(employees)
+                & (attendance.docstatus < 2)
+                & (attendance.attendance_date.between(from_date, to_date))
+                & (attendance.shift.isnull() | (attendance.shift == shift_type))
+            )
+        ).run()
+    )
+
+
+def get_pending_checkins(shift_type, employees):
+    """Load the unprocessed checkins of a shift's ended occurrences for many employees at once."""
+    checkin = frappe.qb.DocType("Employee Checkin")
+    return (
+        get_pending_checkins_query(shift_type)
+        .select(
+            checkin.name,
+            checkin.employee,
+            checkin.log_type,
+            checkin.time,
+            checkin.shift,
+            checkin.shift_start,
+            checkin.shift_end,
+            checkin.shift_actual_start,
+            checkin.shift_actual_end,
+            checkin.device_id,
+        )
+        .where(checkin.employee.isin(employees))
+        .orderby(checkin.employee)
+        .orderby(checkin.time)
+    ).run(as_dict=True)
+
+
+def get_employees_with_pending_checkins(shift_type):
+    checkin = frappe.qb.DocType("Employee Checkin")
+    return get_pending_checkins_query(shift_type).select(checkin.employee).distinct().run(pluck=True)
+
+
+def get_pending_checkins_query(shift_type):
+    checkin = frappe.qb.DocType("Employee Checkin")
+    return frappe.qb.from_(checkin).where(
+        (checkin.skip_auto_attendance == 0)
+        & (checkin.attendance.isnull())
+        & (checkin.shift == shift_type.name)
+        & (checkin.time >= shift_type.process_attendance_after)
+        & (checkin.shift_actual_end < get_processed_until(shift_type))
+    )
+
+
+def get_chunk_key(shift_type, employees):
+    key = f"{shift_type.name}|{shift_type.last_sync_of_checkin}|{'|'.join(employees)}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def get_processed_until(shift_type):
+    """Shifts ending before this instant are complete; checkin sync lag is respected when tracked."""
+    return get_datetime(shift_type.last_sync_of_checkin) if shift_type.last_sync_of_checkin else now_datetime()
+
+
+def get_attendance_lock(shift_type):
+    """Lock taken by every run marking attendance of a shift, across workers.
+
+    Duplicate attendance is only checked against what is already in the database, so two runs
+    writing the same shift at once could both insert one employee's day. After acquiring the
+    lock, a run starts a new transaction to see what the previous holder committed.
+    """
+    cache = frappe.cache()
+    return cache.lock(cache.make_key(f"cw_hrms:attendance:{shift_type}"), timeout=ATTENDANCE_LOCK_TIMEOUT)
+
+
+def get_attendance_batch_size():
+    return cint(frappe.conf.get("cw_hrms_auto_attendance_batch_size")) or ATTENDANCE_BATCH_SIZE
+
+
+# Incremental processing
+# ----------------------
+# Each auto attendance shift keeps a watermark: the (creation, name) of the last Employee
+# Checkin it has processed. A run only reads checkins created after it, marks the employee
+# shifts they touch and moves the watermark forward. Marking is idempotent (linked checkins
+# and existing attendance are skipped), so a run that dies before the watermark moves is
+# simply repeated by the next one.
+
+WATERMARK_DOCTYPE = "Checkin Watermark"
+WATERMARK_BATCH_SIZE = 5000
+
+
+def enqueue_incremental_attendance():
+    for shift_type in frappe.get_all("Shift Type", filters={"enable_auto_attendance": 1}, pluck="name"):
+        frappe.enqueue(
+            process_new_checkins,
+            queue="long",
+            job_id=f"cw_hrms::incremental_attendance::{shift_type}",
+            deduplicate=True,
+            shift_type=shift_type,
+        )
+
+
+def process_new_checkins(shift_type):
+    """Mark attendance for the employee shifts touched by checkins created since the watermark.
+
+    Skipped while another run holds the shift's attendance lock; the next run picks the checkins up.
+    """
+    lock = get_attendance_lock(shift_type)
+    if not lock.acquire(blocking=False):
+        return
+    try:
+        frappe.db.commit()
+        mark_new_checkins(shift_type)
+    finally:
+        lock.release()
+
+
+def mark_new_checkins(shift_type):
+    shift_type = frappe.get_doc("Shift Type", shift_type)
+    if not (cint(shift_type.enable_auto_attendance) and shift_type.process_attendance_after):
+        return
+
+    watermark = get_watermark(shift_type)
+    checkins = get_checkins_after(shift_type, watermark)
+    if not checkins:
+        return
+
+    # Stop before the first checkin whose shift has not ended yet, it is picked up again later
+    processed_until = get_processed_until(shift_type)
+    processed = []
+    for checkin in checkins:
+        if checkin.shift_actual_end and checkin.shift_actual_end >= processed_until:
+            break
+        processed.append(checkin)
+
+    if not processed:
+        return
+
+    affected = {(c.employee, c.shift_start) for c in processed if c.shift_start and not c.attendance}
+    if affected:
+        logs = get_pending_checkins(shift_type, list({employee for employee, _shift_start in affected}))
+        mark_attendance_from_logs(shift_type, [log for log in logs if (log.employee, log.shift_start) in affected])
+
+    advance_watermark(shift_type.name, watermark, processed[-1])
+    frappe.db.commit()
+
+
+def get_watermark(shift_type):
+    watermark = frappe.db.get_value(
+        WATERMARK_DOCTYPE, shift_type.name, ["last_checkin_creation", "last_checkin"], as_dict=True
+    )
+    if watermark:
+        return watermark
+
+    frappe.get_doc(
+        {
+            "doctype": WATERMARK_DOCTYPE,
+            "shift_type": shift_type.name,
+            "last_checkin_creation": get_datetime(shift_type.process_attendance_after),
+            "last_checkin": "",
+        }
+    ).insert(ignore_permissions=True)
+    return frappe._dict(last_checkin_creation=get_datetime(shift_type.process_attendance_after), last_checkin="")
+
+
+def get_checkins_after(shift_type, watermark):
+    checkin = frappe.qb.DocType("Employee Checkin")
+    creation, name = watermark.last_checkin_creation, watermark.last_checkin or ""
+    return (
+        frappe.qb.from_(checkin)
+        .select(
+            checkin.name,
+            checkin.creation,
+            checkin.employee,
+            checkin.shift_start,
+            checkin.shift_actual_end,
+            checkin.attendance,
+        )
+        .where(
+            (checkin.shift == shift_type.name)
+            & ((checkin.creation > creation) | ((checkin.creation == creation) & (checkin.name > name)))
+        )
+        .orderby(checkin.creation)
+        .orderby(checkin.name)
+        .limit(WATERMARK_BATCH_SIZE)
+    ).run(as_dict=True)
+
+
+def advance_watermark(shift_type, watermark, last_checkin):
+    """Move the watermark to `last_checkin` unless another run has moved it in the meantime."""
+    watermark_table = frappe.qb.DocType(WATERMARK_DOCTYPE)
+    frappe.qb.update(watermark_table).set(watermark_table.last_checkin_creation, last_checkin.creation).set(
+        watermark_table.last_checkin, last_checkin.name
+    ).set(watermark_table.last_run, now_datetime()).set(watermark_table.modified, now_datetime()).where(
+        (watermark_table.name == shift_type)
+        & (watermark_table.last_checkin_creation == watermark.last_checkin_creation)
+        & (watermark_table.last_checkin == (watermark.last_checkin or ""))
+    ).run()
@@ -0,0 +1,8 @@
+// Copyright (c) 2026, Codeware Limited and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Attendance Daily Fact", {
+// 	refresh(frm) {
+
+// 	},
+// });
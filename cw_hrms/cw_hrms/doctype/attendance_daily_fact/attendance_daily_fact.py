@@ -0,0 +1,15 @@
+# Copyright (c) 2026, Codeware Limited and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class AttendanceDailyFact(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Attendance Daily Fact", ["company", "attendance_date"])
+	frappe.db.add_index("Attendance Daily Fact", ["employee", "attendance_date"])
+	frappe.db.add_index("Attendance Daily Fact", ["attendance_date", "employee"])
@@ -0,0 +1,14 @@
+# Copyright (c) 2026, Codeware Limited and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class AttendanceMonthlyRollup(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Attendance Monthly Rollup", ["month", "employee"])
+	frappe.db.add_index("Attendance Monthly Rollup", ["company", "month"])
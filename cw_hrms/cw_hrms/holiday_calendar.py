@@ -0,0 +1,96 @@
+# Copyright (c) 2025, Codeware Limited and contributors
+# For license information, please see license.txt
+
+import frappe
+
+HOLIDAY_CALENDAR_CACHE_KEY = "cw_hrms:holiday_calendar"
+
+
+def get_holiday_calendar(holiday_lists):
+    """Return `{holiday_list: {holiday_date: weekly_off}}` for the given holiday lists.
+
+    Lists already cached in Redis are served from there, the rest are loaded
+    with a single query and written back to the cache.
+    """
+    cache = frappe.cache()
+    calendar = {}
+    missing = []
+
+    for h_list in {h for h in holiday_lists if h}:
+        holidays = cache.hget(HOLIDAY_CALENDAR_CACHE_KEY, h_list)
+        if holidays is None:
+            missing.append(h_list)
+        else:
+            calendar[h_list] = holidays
+
+    if missing:
+        holiday = frappe.qb.DocType("Holiday")
+        rows = (
+            frappe.qb.from_(holiday)
+            .select(holiday.parent, holiday.holiday_date, holiday.weekly_off)
+            .where(holiday.parent.isin(missing))
+        ).run(as_dict=True)
+
+        loaded = {h_list: {} for h_list in missing}
+        for row in rows:
+            loaded[row.parent][row.holiday_date] = 1 if row.weekly_off else 0
+
+        for h_list, holidays in loaded.items():
+            cache.hset(HOLIDAY_CALENDAR_CACHE_KEY, h_list, holidays)
+            calendar[h_list] = holidays
+
+    return calendar
+
+
+def get_company_holiday_lists(companies):
+    """Return `{company: default_holiday_list}` for the given companies in one query."""
+    companies = list({c for c in companies if c})
+    if not companies:
+        return {}
+
+    return dict(
+        frappe.get_all(
+            "Company",
+            filters={"name": ["in", companies]},
+            fields=["name", "default_holiday_list"],
+            as_list=True,
+        )
+    )
+
+
+def get_employee_holiday_lists(employees):
+    """Return `{employee: holiday_list}`, falling back to the company's default list, in two queries."""
+    employees = list({e for e in employees if e})
+    if not employees:
+        return {}
+
+    rows = frappe.get_all(
+        "Employee",
+        filters={"name": ["in", employees]},
+        fields=["name", "holiday_list", "company"],
+    )
+    company_holiday_lists = get_company_holiday_lists(row.company for row in rows if not row.holiday_list)
+    return {row.name: row.holiday_list or company_holiday_lists.get(row.company) for row in rows}
+
+
+def get_holiday(calendar, holiday_list, date):
+    """Return None if `date` is a working day, otherwise the holiday's weekly_off flag."""
+    if not holiday_list or not date:
+        return None
+    return calendar.get(holiday_list, {}).get(date)
+
+
+def get_day_type(calendar, holiday_list, date):
+    """Return "Weekend", "Holiday" or "Working Day"; None when there is no holiday list to tell."""
+    if not holiday_list or not date:
+        return None
+
+    weekly_off = get_holiday(calendar, holiday_list, date)
+    if weekly_off is None:
+        return "Working Day"
+    return "Weekend" if weekly_off else "Holiday"
+
+
+def clear_holiday_calendar_cache(doc, method=None):
+    """Drop the cached calendar of a Holiday List when it is saved or deleted."""
+    frappe.cache().hdel(HOLIDAY_CALENDAR_CACHE_KEY, doc.name)
@@ -0,0 +1,48 @@
+# Copyright (c) 2026, Codeware Limited and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.utils import now_datetime
+
+DEFAULT_SERIES_DIGITS = 5
+
+
+def reserve_series_names(series, count):
+    """Reserve `count` consecutive names of a naming series with one counter update.
+
+    Follows Frappe's naming series format (e.g. `HR-ATT-.YYYY.-` or
+    `EMP-CKIN-.MM.-.YYYY.-.######`); must run inside the transaction that inserts the
+    documents so the counter row stays locked until they are written.
+    """
+    if not count:
+        return []
+
+    prefix, digits = parse_series(series)
+    frappe.db.sql(
+        "INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, 0) ON DUPLICATE KEY UPDATE `name` = `name`",
+        prefix,
+    )
+    current = frappe.db.sql("SELECT `current` FROM `tabSeries` WHERE `name` = %s FOR UPDATE", prefix)[0][0]
+    frappe.db.sql("UPDATE `tabSeries` SET `current` = %s WHERE `name` = %s", (current + count, prefix))
+
+    return [f"{prefix}{str(number).zfill(digits)}" for number in range(current + 1, current + count + 1)]
+
+
+def parse_series(series):
+    """Return the counter prefix and number of digits of a naming series for the current date."""
+    today = now_datetime()
+    date_parts = {
+        "YYYY": today.strftime("%Y"),
+        "YY": today.strftime("%y"),
+        "MM": today.strftime("%m"),
+        "DD": today.strftime("%d"),
+    }
+
+    prefix, digits = "", DEFAULT_SERIES_DIGITS
+    for part in series.split("."):
+        if part.startswith("#"):
+            digits = len(part)
+            break
+        prefix += date_parts.get(part, part)
+
+    return prefix, digits
@@ -0,0 +1,143 @@
+# Copyright (c) 2026, Codeware Limited and contributors
+# For license information, please see license.txt
+
+from itertools import groupby
+
+import frappe
+from frappe.utils import add_days, cint, create_batch, get_datetime, getdate
+
+from cw_hrms.cw_hrms.attendance_fact import refresh_attendance_facts
+from cw_hrms.cw_hrms_settings.doctype.general_settings.general_settings import get_general_settings
+
+DEBOUNCE_KEY_PREFIX = "cw_hrms:punch_debounce"
+COMPACTION_EMPLOYEE_BATCH_SIZE = 200
+
+# Default, overridable from site_config. Keys of idle employee/device pairs expire after
+# this, which bounds Redis memory; punches buffered longer than this by a gate are only
+# debounced within their own batch.
+DEBOUNCE_KEY_TTL = 6 * 60 * 60
+
+
+def debounce_punches(punches, window=None):
+    """Split punches into accepted and dropped, dropping repeats of an employee on a device.
+
+    A punch is dropped when it falls within `window` seconds (General Settings by default)
+    of the last accepted punch of the same employee and device, from this batch or an
+    earlier one. The last accepted punch per employee and device is kept in Redis, read for
+    the whole batch at once and written back once the transaction commits, so no database
+    lookup is needed.
+    """
+    window = get_general_settings().punch_debounce_seconds if window is None else window
+    if not (punches and window):
+        return punches, []
+
+    def group_key(punch):
+        return (punch.employee, punch.device_id or "")
+
+    punches = sorted(punches, key=lambda p: (*group_key(p), p.time))
+    groups = [(key, list(group)) for key, group in groupby(punches, key=group_key)]
+
+    cache = frappe.cache()
+    keys = [cache.make_key(get_debounce_key(*key)) for key, _group in groups]
+    last_accepted = cache.mget(keys)
+
+    accepted, dropped, updates = [], [], {}
+    for (key, group), redis_key, last in zip(groups, keys, last_accepted):
+        last = float(last) if last is not None else None
+        for punch in group:
+            epoch = punch.time.timestamp()
+            if last is not None and abs(epoch - last) < window:
+                dropped.append(punch)
+                continue
+            accepted.append(punch)
+            last = epoch if last is None else max(last, epoch)
+        if last is not None:
+            updates[redis_key] = last
+
+    # Only punches that were actually saved may hold back later ones
+    frappe.db.after_commit.add(lambda: remember_accepted(updates))
+    return accepted, dropped
+
+
+def remember_accepted(updates):
+    ttl = cint(frappe.conf.get("cw_hrms_punch_debounce_ttl")) or DEBOUNCE_KEY_TTL
+    pipeline = frappe.cache().pipeline()
+    for redis_key, last in updates.items():
+        pipeline.set(redis_key, last, ex=ttl)
+    pipeline.execute()
+
+
+def get_debounce_key(employee, device_id):
+    return f"{DEBOUNCE_KEY_PREFIX}:{employee}|{device_id}"
+
+
+@frappe.whitelist()
+def enqueue_compact_duplicate_punches(from_date, to_date, window=None):
+    frappe.only_for(["HR Manager", "System Manager"])
+    frappe.enqueue(
+        compact_duplicate_punches,
+        queue="long",
+        timeout=4 * 3600,
+        job_id=f"cw_hrms::compact_punches::{getdate(from_date)}::{getdate(to_date)}",
+        deduplicate=True,
+        from_date=from_date,
+        to_date=to_date,
+        window=window,
+    )
+
+
+def compact_duplicate_punches(from_date, to_date, window=None):
+    """Delete historical repeat punches, a batch of employees per transaction.
+
+    Within each employee, device and log type the first punch of a burst is kept and the
+    ones following it within `window` seconds are deleted, unless they are linked to a
+    different attendance than the kept punch. Returns the number of checkins deleted.
+    """
+    window = cint(window) if window is not None else get_general_settings().punch_debounce_seconds
+    if not window:
+        return 0
+
+    from_time = get_datetime(getdate(from_date))
+    to_time = get_datetime(add_days(getdate(to_date), 1))
+    checkin = frappe.qb.DocType("Employee Checkin")
+    in_range = (checkin.time >= from_time) & (checkin.time < to_time)
+
+    employees = frappe.qb.from_(checkin).select(checkin.employee).distinct().where(in_range).run(pluck=True)
+    deleted = 0
+    for batch in create_batch(sorted(employees), COMPACTION_EMPLOYEE_BATCH_SIZE):
+        checkins = (
+            frappe.qb.from_(checkin)
+            .select(checkin.name, checkin.employee, checkin.device_id, checkin.log_type, checkin.time, checkin.attendance)
+            .where(in_range & checkin.employee.isin(batch))
+            .orderby(checkin.employee)
+            .orderby(checkin.time)
+            .orderby(checkin.name)
+        ).run(as_dict=True)
+
+        duplicates = find_duplicates(checkins, window)
+        if duplicates:
+            frappe.db.delete("Employee Checkin", {"name": ("in", [d.name for d in duplicates])})
+            refresh_attendance_facts({d.attendance for d in duplicates if d.attendance})
+            deleted += len(duplicates)
+        frappe.db.commit()
+
+    return deleted
+
+
+def find_duplicates(checkins, window):
+    def group_key(checkin):
+        return (checkin.employee, checkin.device_id or "", checkin.log_type or "")
+
+    duplicates = []
+    for _key, group in groupby(sorted(checkins, key=lambda c: (*group_key(c), c.time)), key=group_key):
+        kept = None
+        for checkin in group:
+            if (
+                kept
+                and (checkin.time - kept.time).total_seconds() < window
+                and (not checkin.attendance or checkin.attendance == kept.attendance)
+            ):
+                duplicates.append(checkin)
+            else:
+                kept = checkin
+    return duplicates
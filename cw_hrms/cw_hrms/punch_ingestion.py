@@ -0,0 +1,228 @@
+# Copyright (c) 2026, Codeware Limited and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.utils import cint, get_datetime, now
+
+from cw_hrms.cw_hrms.naming import reserve_series_names
+from cw_hrms.cw_hrms.punch_debounce import debounce_punches
+from cw_hrms.cw_hrms.shift_resolver import ShiftResolver
+
+EMPLOYEE_DIRECTORY_VERSION_KEY = "cw_hrms:employee_directory:version"
+LOG_TYPES = ("IN", "OUT")
+CHECKIN_FIELDS = (
+    "name",
+    "creation",
+    "modified",
+    "modified_by",
+    "owner",
+    "docstatus",
+    "naming_series",
+    "employee",
+    "employee_name",
+    "log_type",
+    "time",
+    "device_id",
+    "skip_auto_attendance",
+    "shift",
+    "shift_start",
+    "shift_end",
+    "shift_actual_start",
+    "shift_actual_end",
+)
+
+# Default, overridable from site_config
+MAX_PUNCH_BATCH_SIZE = 10000
+
+# {site: (version, directory)}, shared by every request of the process
+_employee_directory = {}
+
+
+@frappe.whitelist(methods=["POST"])
+def ingest_punches(punches):
+    """Create Employee Checkins for a batch of gate punches in one transaction.
+
+    Each punch is `{"device_id", "employee" or "card_id", "timestamp", "log_type"}`; a card
+    id is the employee's Attendance Device ID. Repeat taps within the debounce window and
+    punches already recorded, in the database or earlier in the batch, are skipped. Returns
+    `{"inserted": count, "debounced": count, "duplicates": count, "failed": [{"idx", "error"}]}`.
+    """
+    frappe.has_permission("Employee Checkin", "create", throw=True)
+
+    punches = frappe.parse_json(punches)
+    max_batch_size = cint(frappe.conf.get("cw_hrms_max_punch_batch_size")) or MAX_PUNCH_BATCH_SIZE
+    if len(punches) > max_batch_size:
+        frappe.throw(_("A batch can not have more than {0} punches").format(max_batch_size))
+
+    valid, failed = validate_punches(punches)
+    valid, debounced = debounce_punches(valid)
+    valid, duplicates = remove_duplicates(valid)
+    resolve_shifts(valid)
+    insert_checkins(valid)
+    frappe.db.commit()
+
+    return {"inserted": len(valid), "debounced": len(debounced), "duplicates": duplicates, "failed": failed}
+
+
+def validate_punches(punches):
+    directory = get_employee_directory()
+    valid, failed = [], []
+
+    for idx, punch in enumerate(punches):
+        punch = frappe._dict(punch)
+        employee = punch.employee or directory.cards.get(str(punch.card_id or ""))
+        details = directory.employees.get(employee)
+        log_type = (punch.log_type or "").upper() or None
+
+        error = None
+        if not details:
+            error = _("No employee found for {0}").format(punch.employee or punch.card_id)
+        elif details.status != "Active":
+            error = _("Employee {0} is not active").format(employee)
+        elif not punch.timestamp:
+            error = _("Timestamp is mandatory")
+        elif log_type and log_type not in LOG_TYPES:
+            error = _("Invalid log type {0}").format(punch.log_type)
+
+        if not error:
+            try:
+                time = get_datetime(punch.timestamp)
+            except Exception:
+                error = _("Invalid timestamp {0}").format(punch.timestamp)
+
+        if error:
+            failed.append({"idx": idx, "error": error})
+            continue
+
+        valid.append(
+            frappe._dict(
+                employee=employee,
+                employee_name=details.employee_name,
+                time=time.replace(microsecond=0),
+                log_type=log_type,
+                device_id=punch.device_id,
+            )
+        )
+
+    return valid, failed
+
+
+def remove_duplicates(punches):
+    """Drop punches whose employee and time are already recorded, looked up in one query."""
+    if not punches:
+        return punches, 0
+
+    checkin = frappe.qb.DocType("Employee Checkin")
+    seen = set(
+        (
+            frappe.qb.from_(checkin)
+            .select(checkin.employee, checkin.time)
+            .where(
+                checkin.employee.isin(list({p.employee for p in punches}))
+                & (checkin.time >= min(p.time for p in punches))
+                & (checkin.time <= max(p.time for p in punches))
+            )
+        ).run()
+    )
+
+    unique = []
+    for punch in sorted(punches, key=lambda p: (p.employee, p.time)):
+        key = (punch.employee, punch.time)
+        if key not in seen:
+            seen.add(key)
+            unique.append(punch)
+
+    return unique, len(punches) - len(unique)
+
+
+def resolve_shifts(punches):
+    """Fill the shift fields the way Employee Checkin does, from one ShiftResolver for the batch."""
+    if not punches:
+        return
+
+    times = [p.time for p in punches]
+    resolver = ShiftResolver({p.employee for p in punches}, min(times).date(), max(times).date())
+    for punch in punches:
+        shift = resolver.get_shift(punch.employee, punch.time)
+        if shift:
+            punch.update(
+                shift=shift.shift_type,
+                shift_start=shift.start,
+                shift_end=shift.end,
+                shift_actual_start=shift.actual_start,
+                shift_actual_end=shift.actual_end,
+            )
+
+
+def insert_checkins(punches):
+    if not punches:
+        return
+
+    naming_series = get_checkin_naming_series()
+    names = reserve_series_names(naming_series, len(punches))
+    timestamp, user = now(), frappe.session.user
+
+    frappe.db.bulk_insert(
+        "Employee Checkin",
+        CHECKIN_FIELDS,
+        [
+            (
+                name,
+                timestamp,
+                timestamp,
+                user,
+                user,
+                0,
+                naming_series,
+                punch.employee,
+                punch.employee_name,
+                punch.log_type,
+                punch.time,
+                punch.device_id,
+                0,
+                punch.shift,
+                punch.shift_start,
+                punch.shift_end,
+                punch.shift_actual_start,
+                punch.shift_actual_end,
+            )
+            for name, punch in zip(names, punches)
+        ],
+    )
+
+
+def get_checkin_naming_series():
+    return (frappe.get_meta("Employee Checkin").get_field("naming_series").options or "EMP-CKIN-.MM.-.YYYY.-").split(
+        "\n"
+    )[0]
+
+
+def get_employee_directory():
+    """Return `{"cards": {card_id: employee}, "employees": {employee: details}}`, loaded once per process.
+
+    A Redis version key, bumped whenever an Employee changes, tells every process to reload.
+    """
+    cache = frappe.cache()
+    version = cache.get_value(EMPLOYEE_DIRECTORY_VERSION_KEY)
+    if version is None:
+        version = now()
+        cache.set_value(EMPLOYEE_DIRECTORY_VERSION_KEY, version)
+
+    site = frappe.local.site
+    cached = _employee_directory.get(site)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    employees = frappe.get_all("Employee", fields=["name", "employee_name", "status", "attendance_device_id"])
+    directory = frappe._dict(
+        cards={e.attendance_device_id: e.name for e in employees if e.attendance_device_id},
+        employees={e.name: e for e in employees},
+    )
+    _employee_directory[site] = (version, directory)
+    return directory
+
+
+def clear_employee_directory_cache(doc=None, method=None):
+    frappe.cache().set_value(EMPLOYEE_DIRECTORY_VERSION_KEY, now())
+    _employee_directory.pop(frappe.local.site, None)
@@ -1,6 +1,25 @@
 // Copyright (c) 2023, Frappe Technologies Pvt. Ltd. and contributors
 // For license information, please see license.txt
 
+// filters that can not be combined: checking one unchecks the others
+const EXCLUSIVE_FILTERS = {
+	show_all_days: ["paginate", "summary_only"],
+	paginate: ["show_all_days"],
+	summary_only: ["show_all_days"],
+};
+
+function set_exclusive_filter(report, fieldname) {
+	const others = report.get_filter_value(fieldname)
+		? EXCLUSIVE_FILTERS[fieldname].filter((other) => report.get_filter_value(other))
+		: [];
+	if (!others.length) {
+		report.refresh();
+		return;
+	}
+	// their own change refreshes the report
+	report.set_filter_value(Object.fromEntries(others.map((other) => [other, 0])));
+}
+
 frappe.query_reports["Custom Shift Attendance"] = {
 	filters: [
 		{
@@ -59,8 +78,119 @@ frappe.query_reports["Custom Shift Attendance"] = {
 			fieldtype: "Check",
 			default: 1,
 		},
+		{
+			fieldname: "summary_only",
+			label: __("Summary Only"),
+			fieldtype: "Check",
+			on_change: (report) => set_exclusive_filter(report, "summary_only"),
+		},
+		{
+			fieldname: "show_all_days",
+			label: __("Show All Days"),
+			fieldtype: "Check",
+			description: __("Also list unmarked days, weekends and holidays without attendance"),
+			on_change: (report) => set_exclusive_filter(report, "show_all_days"),
+		},
+		{
+			fieldname: "compact",
+			label: __("Compact Payload"),
+			fieldtype: "Check",
+			description: __("Faster for large ranges: values are formatted in the browser"),
+		},
+		{
+			fieldname: "paginate",
+			label: __("Load on Scroll"),
+			fieldtype: "Check",
+			description: __("Show the first rows at once and fetch the rest while scrolling"),
+			on_change: (report) => set_exclusive_filter(report, "paginate"),
+		},
+		{
+			fieldname: "show_timings",
+			label: __("Show Timings"),
+			fieldtype: "Check",
+			hidden: !frappe.user.has_role("System Manager"),
+		},
 	],
+	onload: (report) => {
+		// reload once the background run of a large range has been prepared for the current filters
+		frappe.realtime.on("cw_hrms_report_ready", (data) => {
+			if (data.report_name !== report.report_name || !frappe.get_route_str().includes(report.report_name)) {
+				return;
+			}
+			frappe.call({
+				method: "cw_hrms.cw_hrms.report.custom_shift_attendance.custom_shift_attendance.get_report_filters_key",
+				args: { filters: report.get_filter_values() },
+				callback: (r) => r.message === data.filters_key && report.refresh(),
+			});
+		});
+
+		// large ranges are streamed to a file by a background job instead of the browser export
+		report.page.add_inner_button(__("Export Large Range"), () => {
+			frappe.prompt(
+				{
+					fieldname: "file_format",
+					label: __("Format"),
+					fieldtype: "Select",
+					options: ["CSV", "Excel"],
+					default: "CSV",
+				},
+				(values) => {
+					frappe.call({
+						method: "cw_hrms.cw_hrms.attendance_export.export_shift_attendance",
+						args: { filters: report.get_filter_values(), file_format: values.file_format },
+						callback: (r) => r.message && frappe.show_alert({ message: r.message, indicator: "blue" }),
+					});
+				},
+				__("Export Large Range"),
+				__("Export")
+			);
+		});
+		frappe.realtime.on("cw_hrms_export_ready", (data) => {
+			if (data.report_name !== report.report_name) return;
+			frappe.msgprint({
+				title: __("Export Ready"),
+				indicator: "green",
+				message: __("{0} rows exported. {1}", [
+					data.rows,
+					`<a href="${encodeURI(data.file_url)}" target="_blank">${__("Download")}</a>`,
+				]),
+			});
+		});
+	},
+	after_datatable_render: (datatable) => {
+		const report = frappe.query_report;
+		if (!report.get_filter_value("paginate")) return;
+
+		// keyset pages: the key of the next page is the last loaded row's (attendance_date, employee, name)
+		let loading = false;
+		let has_more = report.data.length > 0;
+		const scrollable = datatable.bodyScrollable;
+		$(scrollable).off("scroll.cw_hrms").on("scroll.cw_hrms", () => {
+			if (loading || !has_more) return;
+			if (scrollable.scrollTop + scrollable.clientHeight < scrollable.scrollHeight - 200) return;
+
+			const last = report.data[report.data.length - 1];
+			loading = true;
+			frappe
+				.xcall("cw_hrms.cw_hrms.report.custom_shift_attendance.custom_shift_attendance.get_page", {
+					filters: report.get_filter_values(),
+					after: [last.attendance_date, last.employee, last.name],
+				})
+				.then((page) => {
+					has_more = page.has_more;
+					if (page.rows.length) {
+						report.data.push(...page.rows);
+						datatable.appendRows(page.rows);
+					}
+				})
+				.finally(() => (loading = false));
+		});
+	},
 	formatter: (value, row, column, data, default_formatter) => {
+		const df = column.docfield || column;
+		if (df.dictionary || df.compact) {
+			value = decode_compact_value(value, df, data);
+		}
 		value = default_formatter(value, row, column, data);
 		if (
 			(column.fieldname === "in_time" && data.late_entry) ||
@@ -71,3 +201,37 @@ frappe.query_reports["Custom Shift Attendance"] = {
 		return value;
 	},
 };
+
+// Compact payloads carry dictionary codes, naive epoch seconds and durations in seconds
+function decode_compact_value(value, df, data) {
+	if (df.dictionary) {
+		value = value ? df.dictionary[value] : null;
+		if (df.fieldname === "status" && value && data.show_working_hours) {
+			value = `${value} (${seconds_to_hms(data.working_hours)})`;
+		}
+		return value;
+	}
+	if (!value) {
+		return df.compact === "hms" ? seconds_to_hms(0) : null;
+	}
+	if (df.compact === "hms") {
+		return seconds_to_hms(value);
+	}
+	if (df.compact === "duration") {
+		return frappe.utils.get_formatted_duration(value);
+	}
+
+	// the epoch is naive, read it as UTC so the browser's timezone does not shift it
+	const time = moment.utc(value * 1000);
+	const pair = data[df.pair];
+	if (pair && Math.floor(pair / 86400) === Math.floor(value / 86400)) {
+		return time.format("HH:mm:ss");
+	}
+	return frappe.datetime.str_to_user(time.format("YYYY-MM-DD HH:mm:ss"));
+}
+
+function seconds_to_hms(seconds) {
+	seconds = Math.max(Math.floor(seconds || 0), 0);
+	const pad = (n) => String(n).padStart(2, "0");
+	return `${pad(Math.floor(seconds / 3600))}:${pad(Math.floor((seconds % 3600) / 60))}:${pad(seconds % 60)}`;
+}
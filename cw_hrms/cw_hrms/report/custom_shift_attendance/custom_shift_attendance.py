@@ -1,24 +1,185 @@
 # Copyright (c) 2023, Frappe Technologies Pvt. Ltd. and contributors
 # For license information, please see license.txt
 
-from datetime import timedelta
 import frappe
 from frappe import _
-from frappe.utils import cint, flt, format_datetime, format_duration
-from erpnext.setup.doctype.holiday_list.holiday_list import is_holiday
+from frappe.utils import cint, date_diff, flt, format_datetime, format_duration
+from frappe.query_builder.functions import Count
 from frappe.utils import getdate, nowdate
 
+from cw_hrms.cw_hrms.attendance_fact import facts_cover
+from cw_hrms.cw_hrms.attendance_grid import get_calendar_gaps
+from cw_hrms.cw_hrms.attendance_rollup import get_attendance_counters
+from cw_hrms.cw_hrms.attendance_kernel import compute_row_metrics, from_epoch_seconds
+from cw_hrms.cw_hrms.holiday_calendar import get_company_holiday_lists, get_day_type, get_holiday_calendar
+from cw_hrms.cw_hrms.report_cache import (
+    get_cached_result,
+    get_data_version,
+    get_filters_key,
+    pop_prepared_result,
+    set_cached_result,
+    set_prepared_result,
+)
+from cw_hrms.cw_hrms.report_payload import compact_rows, get_page_size, paginate
+from cw_hrms.cw_hrms.report_timing import ReportTimer, show_timings
+from cw_hrms.cw_hrms.shift_resolver import ShiftResolver
+from cw_hrms.cw_hrms_settings.doctype.general_settings.general_settings import get_general_settings
+
+# বড় রেঞ্জের রিপোর্ট ব্যাকগ্রাউন্ডে চলবে; site_config থেকে থ্রেশহোল্ড বদলানো যায়
+BACKGROUND_DAYS_THRESHOLD = 62
+BACKGROUND_ROWS_THRESHOLD = 20000
+REPORT_FILTER_KEYS = (
+    "from_date", "to_date", "employee", "company", "consider_grace_period", "summary_only", "compact",
+    "paginate", "show_all_days"
+)
+# সামারিতে শুধু এই ফিল্টারগুলো খাটে, ডিটেইল রো-এর মতোই
+SUMMARY_FILTER_KEYS = ("from_date", "to_date", "employee", "company", "consider_grace_period")
+# কম্প্যাক্ট মোডে এই কলামগুলো ডিকশনারি কোড আর সময়গুলো epoch সেকেন্ড হিসেবে যায়
+COMPACT_DICTIONARY_FIELDS = ("employee", "employee_name", "shift", "status", "department", "company")
+COMPACT_EPOCH_FIELDS = ("shift_start", "shift_end", "in_time", "out_time")
+
+
 def execute(filters=None):
     if not filters:
         filters = {}
+    filters = frappe._dict(filters)
+    # এক্সপোর্টে ফরম্যাট করা মান লাগে, তাই সেখানে কম্প্যাক্ট মোড নয়
+    if filters.get("compact") and frappe.form_dict.get("cmd") == "frappe.desk.query_report.export_query":
+        filters.compact = 0
+    # পেজগুলো আলাদা কলে আসে, প্রতি পেজের আলাদা ডিকশনারি মেলানো যায় না
+    if filters.get("paginate"):
+        filters.compact = 0
+    validate_filters(filters)
+
+    with ReportTimer("Custom Shift Attendance", filters, REPORT_FILTER_KEYS) as timer:
+        # একই ফিল্টার ও অপরিবর্তিত ডেটা হলে ক্যাশ থেকে রেজাল্ট
+        with timer.stage("cache_lookup"):
+            data_version = get_data_version(filters)
+            # টাইমিং দেখতে চাইলে ক্যাশ বাদ দিয়ে পুরো রান
+            cached = None
+            if not show_timings(filters):
+                cached = get_cached_result("custom_shift_attendance", filters, data_version, REPORT_FILTER_KEYS)
+        if cached:
+            return cached
+
+        # শুধু কার্ড ও চার্ট চাইলে ডিটেইল রো ছাড়াই এক কুয়েরিতে
+        if filters.get("summary_only"):
+            with timer.stage("summary_query"):
+                report_summary, chart = get_summary_data(filters)
+            result = get_columns(), [], None, chart, report_summary
+            with timer.stage("cache_store"):
+                set_cached_result("custom_shift_attendance", filters, data_version, result, REPORT_FILTER_KEYS)
+            return with_timings(result, filters, timer)
+
+        # প্রথম পেজ আর মোট হিসাব আলাদা কুয়েরিতে; বাকি পেজ স্ক্রলে get_page থেকে
+        if filters.get("paginate"):
+            with timer.stage("summary_query"):
+                report_summary, chart = get_summary_data(filters)
+            result = get_columns(), get_data(filters, timer, page=(None, None)), None, chart, report_summary
+            with timer.stage("cache_store"):
+                set_cached_result("custom_shift_attendance", filters, data_version, result, REPORT_FILTER_KEYS)
+            return with_timings(result, filters, timer)
+
+        # ব্যাকগ্রাউন্ডে তৈরি রেজাল্ট একবারই দেখানো হয়, লাইভ পাঞ্চে ভার্সন বদলালেও
+        if not filters.get("background_run"):
+            prepared = pop_prepared_result("custom_shift_attendance", filters, REPORT_FILTER_KEYS)
+            if prepared:
+                return prepared
+
+        if not filters.get("background_run") and should_run_in_background(filters):
+            enqueue_report(filters)
+            message = _("This report covers a large range and is being prepared in the background. "
+                        "It will reload automatically when ready.")
+            return get_columns(), [], message, None, []
+
+        columns = get_columns()
+        data = get_data(filters, timer)
+        publish_report_progress(filters, 80, _("Building summary"))
+        with timer.stage("chart"):
+            chart = get_chart_data(data)
+        # চার্ট শুধু হাজিরার রেকর্ডের; ফাঁকা দিনগুলো কার্ড ও টেবিলে যোগ হয়
+        if filters.get("show_all_days"):
+            with timer.stage("calendar_grid") as stage:
+                data = add_calendar_gaps(data, filters)
+                stage.rows = len(data)
+        with timer.stage("report_summary"):
+            report_summary = get_report_summary(data)
+        if filters.get("compact"):
+            with timer.stage("compact") as stage:
+                stage.rows = len(data)
+                columns, data = compact_rows(
+                    get_compact_columns(), data, COMPACT_DICTIONARY_FIELDS, COMPACT_EPOCH_FIELDS
+                )
+        publish_report_progress(filters, 100, _("Done"))
+
+        # অপ্রয়োজনীয় throw এবং self কল মুছে ফেলা হয়েছে যাতে রিপোর্ট লোড হয়
+        result = columns, data, None, chart, report_summary
+        with timer.stage("cache_store"):
+            set_cached_result("custom_shift_attendance", filters, data_version, result, REPORT_FILTER_KEYS)
+
+        return with_timings(result, filters, timer)
+
+
+def with_timings(result, filters, timer):
+    """The result with the stage timings as its message, when asked for."""
+    if not show_timings(filters):
+        return result
+    columns, data, _message, chart, report_summary = result
+    return columns, data, timer.as_html(), chart, report_summary
+
+
+def validate_filters(filters):
+    # ফাঁকা দিনগুলো পুরো রেঞ্জের হাজিরা থেকে বের হয়, পেজে পেজে নয়
+    if filters.get("show_all_days") and filters.get("paginate"):
+        frappe.throw(_("Show All Days can not be combined with Load on Scroll"))
+    if filters.get("show_all_days") and filters.get("summary_only"):
+        frappe.throw(_("Show All Days can not be combined with Summary Only"))
+
+
+def should_run_in_background(filters):
+    days_threshold = cint(frappe.conf.get("cw_hrms_background_report_days")) or BACKGROUND_DAYS_THRESHOLD
+    rows_threshold = cint(frappe.conf.get("cw_hrms_background_report_rows")) or BACKGROUND_ROWS_THRESHOLD
+
+    if filters.get("from_date") and filters.get("to_date"):
+        if date_diff(filters.get("to_date"), filters.get("from_date")) + 1 > days_threshold:
+            return True
+
+    # রো সংখ্যা আন্দাজ করার জন্য শুধু attendance ইনডেক্সে COUNT
+    attendance = frappe.qb.DocType("Attendance")
+    query = frappe.qb.from_(attendance).select(Count("*")).where(attendance.docstatus == 1)
+    query = apply_filters(query, attendance, filters)
+    return cint(query.run()[0][0]) > rows_threshold
+
+
+def enqueue_report(filters):
+    frappe.enqueue(
+        "cw_hrms.cw_hrms.report.custom_shift_attendance.custom_shift_attendance.run_in_background",
+        queue="long",
+        timeout=3600,
+        job_id=f"custom_shift_attendance::{get_filters_key(filters, REPORT_FILTER_KEYS)}",
+        deduplicate=True,
+        filters=filters,
+    )
+
 
-    columns = get_columns()
-    data = get_data(filters)
-    chart = get_chart_data(data)
-    report_summary = get_report_summary(data)
+def run_in_background(filters):
+    filters = frappe._dict(filters)
+    filters.background_run = 1
+    publish_report_progress(filters, 0, _("Fetching attendance"))
+
+    # ক্যাশের ভার্সন রান চলাকালীন পুরনো হতে পারে, তাই রেজাল্ট ফিল্টার ধরে আলাদা রাখা
+    set_prepared_result("custom_shift_attendance", filters, execute(filters), REPORT_FILTER_KEYS)
+    frappe.publish_realtime(
+        "cw_hrms_report_ready",
+        {"report_name": "Custom Shift Attendance", "filters_key": get_filters_key(filters, REPORT_FILTER_KEYS)},
+        user=frappe.session.user,
+    )
+
+
+def publish_report_progress(filters, percent, description):
+    if filters.get("background_run"):
+        frappe.publish_progress(percent, title=_("Custom Shift Attendance"), description=description)
 
-    # অপ্রয়োজনীয় throw এবং self কল মুছে ফেলা হয়েছে যাতে রিপোর্ট লোড হয়
-    return columns, data, None, chart, report_summary
 
 def get_columns():
     return [
@@ -39,21 +200,117 @@ def get_columns():
         {"label": _("Attendance ID"), "fieldname": "name", "fieldtype": "Link", "options": "Attendance", "width": 150},
     ]
 
-def get_data(filters):
-    query = get_query(filters)
-    data = query.run(as_dict=True)
-    data = update_data(data, filters)
+def add_calendar_gaps(data, filters):
+    """Add Unmarked, Weekend and Holiday rows for days without attendance, sorted by employee and date."""
+    gaps = get_calendar_gaps(filters, data)
+    for d in gaps:
+        d.working_hours = 0 if filters.get("compact") else format_seconds_to_hms(0)
+    return sorted(data + gaps, key=lambda d: (d.employee or "", getdate(d.attendance_date)))
+
+
+def get_compact_columns():
+    """Columns of the compact payload; the browser formats their raw values."""
+    formats = {
+        "shift_start": {"compact": "epoch", "pair": "shift_end"},
+        "shift_end": {"compact": "epoch", "pair": "shift_start"},
+        "in_time": {"compact": "epoch", "pair": "out_time"},
+        "out_time": {"compact": "epoch", "pair": "in_time"},
+        "working_hours": {"compact": "hms"},
+        "late_entry_hrs": {"compact": "duration"},
+        "early_exit_hrs": {"compact": "duration"},
+    }
+    columns = [{**column, **formats.get(column["fieldname"], {})} for column in get_columns()]
+    # ফরম্যাটারের দরকারি ফ্ল্যাগ, আগে এগুলো রো-এর বাড়তি কী ছিল
+    return columns + [
+        {"fieldname": fieldname, "fieldtype": "Check", "label": label, "hidden": 1}
+        for fieldname, label in (
+            ("late_entry", _("Late Entry")),
+            ("early_exit", _("Early Exit")),
+            ("show_working_hours", _("Show Working Hours")),
+        )
+    ]
+
+def get_data(filters, timer, page=None):
+    """Report rows; with `page` as `(after, page_size)` only that page in key order."""
+    if facts_cover(filters.get("from_date")):
+        return get_fact_data(filters, timer, page)
+
+    with timer.stage("query") as stage:
+        query = get_query(filters)
+        if page:
+            attendance = frappe.qb.DocType("Attendance")
+            query = paginate(query, (attendance.attendance_date, attendance.employee, attendance.name), *page)
+        data = query.run(as_dict=True)
+        stage.rows = len(data)
+    publish_report_progress(filters, 40, _("Calculating working hours"))
+    data = update_data(data, filters, timer)
     return data
 
+def get_fact_data(filters, timer, page=None):
+    with timer.stage("fact_query") as stage:
+        query = get_fact_query(filters)
+        if page:
+            fact = frappe.qb.DocType("Attendance Daily Fact")
+            query = paginate(query, (fact.attendance_date, fact.employee, fact.attendance), *page)
+        data = query.run(as_dict=True)
+        stage.rows = len(data)
+    publish_report_progress(filters, 40, _("Calculating working hours"))
+
+    with timer.stage("render") as stage:
+        stage.rows = len(data)
+        return render_fact_rows(data, filters)
+
+
+def get_fact_query(filters):
+    # প্রি-কম্পিউটেড ফ্যাক্ট টেবিল থেকে সরাসরি ইনডেক্সড রেঞ্জ স্ক্যান
+    fact = frappe.qb.DocType("Attendance Daily Fact")
+    query = frappe.qb.from_(fact).select(
+        fact.attendance.as_("name"), fact.employee, fact.employee_name, fact.shift,
+        fact.attendance_date, fact.status, fact.day_type, fact.department, fact.company,
+        fact.in_epoch, fact.out_epoch, fact.shift_start_epoch, fact.shift_end_epoch,
+        fact.working_seconds, fact.late_seconds, fact.early_seconds, fact.late_entry, fact.early_exit
+    )
+    return apply_filters(query, fact, filters)
+
+
+def render_fact_rows(data, filters):
+    late_seconds, early_seconds = [], []
+    for d in data:
+        d.in_time, d.out_time = from_epoch_seconds(d.in_epoch), from_epoch_seconds(d.out_epoch)
+        d.shift_start, d.shift_end = from_epoch_seconds(d.shift_start_epoch), from_epoch_seconds(d.shift_end_epoch)
+
+        # ফ্যাক্টে গ্রেস ধরে হিসাব রাখা; গ্রেস ছাড়া চাইলে epoch থেকে সরাসরি
+        if filters.get("consider_grace_period"):
+            late_seconds.append(d.late_seconds or 0)
+            early_seconds.append(d.early_seconds or 0)
+        else:
+            late_seconds.append(get_gap(d.shift_start_epoch, d.in_epoch))
+            early_seconds.append(get_gap(d.out_epoch, d.shift_end_epoch))
+
+    return render_rows(
+        data,
+        [d.working_seconds or 0 for d in data],
+        late_seconds,
+        early_seconds,
+        [d.day_type for d in data],
+        filters.get("compact"),
+    )
+
+
+def get_gap(earlier, later):
+    if earlier is None or later is None:
+        return 0
+    return max(later - earlier, 0)
+
+
 def get_query(filters):
+    # শিফটের সময় চেকইন join থেকে নয়, ShiftResolver থেকে আসে
     attendance = frappe.qb.DocType("Attendance")
-    checkin = frappe.qb.DocType("Employee Checkin")
     shift_type = frappe.qb.DocType("Shift Type")
     employee = frappe.qb.DocType("Employee")
 
     query = (
         frappe.qb.from_(attendance)
-        .left_join(checkin).on(checkin.attendance == attendance.name)
         .left_join(shift_type).on(attendance.shift == shift_type.name)
         .left_join(employee).on(attendance.employee == employee.name)
         .select(
@@ -61,7 +318,7 @@ def get_query(filters):
             attendance.shift, attendance.attendance_date, attendance.status,
             attendance.in_time, attendance.out_time, attendance.working_hours,
             attendance.late_entry, attendance.early_exit, attendance.department,
-            attendance.company, checkin.shift_start, checkin.shift_end,
+            attendance.company,
             shift_type.enable_late_entry_marking, shift_type.late_entry_grace_period,
             shift_type.enable_early_exit_marking, shift_type.early_exit_grace_period,
             employee.holiday_list
@@ -69,44 +326,87 @@ def get_query(filters):
         .where(attendance.docstatus == 1)
     )
 
-    # Filters
+    query = apply_filters(query, attendance, filters)
+    return query
+
+
+def apply_filters(query, attendance, filters):
     if filters.get("from_date"): query = query.where(attendance.attendance_date >= filters.get("from_date"))
     if filters.get("to_date"): query = query.where(attendance.attendance_date <= filters.get("to_date"))
     if filters.get("employee"): query = query.where(attendance.employee == filters.get("employee"))
     if filters.get("company"): query = query.where(attendance.company == filters.get("company"))
-
-    query = query.groupby(attendance.name)
     return query
 
 
-def update_data(data, filters):
-    consider_grace = filters.get("consider_grace_period")
-    
+def update_data(data, filters, timer):
+    with timer.stage("holiday_lookup"):
+        # হলিডে লিস্টগুলো একবারেই লোড করা হচ্ছে, প্রতি রো-তে কুয়েরি নয়
+        company_holiday_lists = get_company_holiday_lists(d.company for d in data if not d.get("holiday_list"))
+        holiday_calendar = get_holiday_calendar(
+            d.get("holiday_list") or company_holiday_lists.get(d.company) for d in data
+        )
+
+    with timer.stage("shift_lookup"):
+        resolver = get_shift_resolver(data, filters)
+
+    with timer.stage("update_data") as stage:
+        stage.rows = len(data)
+        return transform_rows(
+            data, filters, company_holiday_lists, holiday_calendar, get_general_settings(), resolver
+        )
+
+
+def get_shift_resolver(data, filters):
+    # রো-এর তারিখই যথেষ্ট; একটা পেজ পুরো রেঞ্জের ছোট অংশ হতে পারে
+    dates = [d.attendance_date for d in data if d.get("attendance_date")]
+    return ShiftResolver(
+        {d.employee for d in data},
+        min(dates, default=None) or filters.get("from_date") or getdate(nowdate()),
+        max(dates, default=None) or filters.get("to_date") or getdate(nowdate()),
+        shift_types={d.shift for d in data},
+    )
+
+
+def transform_rows(data, filters, company_holiday_lists, holiday_calendar, settings, resolver):
+    """Compute and format a batch of query rows; needs no database access."""
     for d in data:
+        d.holiday_list = d.get("holiday_list") or company_holiday_lists.get(d.company)
+        shift = resolver.get_attendance_shift(d.employee, d.attendance_date, d.shift, d.in_time)
+        d.shift_start, d.shift_end = (shift.start, shift.end) if shift else (None, None)
+
+    metrics = compute_row_metrics(
+        data,
+        filters.get("consider_grace_period"),
+        settings.late_in_grace_minutes,
+        settings.early_out_grace_minutes,
+    )
+    day_types = [get_day_type(holiday_calendar, d.holiday_list, d.get("attendance_date")) for d in data]
+    return render_rows(
+        data,
+        metrics.working_seconds.tolist(),
+        metrics.late_seconds.tolist(),
+        metrics.early_seconds.tolist(),
+        day_types,
+        filters.get("compact"),
+    )
+
+
+def render_rows(data, working_seconds, late_seconds, early_seconds, day_types, compact=False):
+    """Set status, flags and formatted timings; with `compact` the timings stay numbers."""
+    for i, d in enumerate(data):
         # ১. কর্মঘণ্টা ক্যালকুলেশন (Out Time - In Time)
-        total_seconds = 0
-        if d.in_time and d.out_time:
-            # timedelta বের করা হচ্ছে
-            diff = d.out_time - d.in_time
-            total_seconds = diff.total_seconds()
-        
+        total_seconds = working_seconds[i]
         # ক্যালকুলেটেড সেকেন্ডকে HMS ফরম্যাটে নেওয়া
-        hms_time = format_seconds_to_hms(total_seconds)
+        hms_time = None if compact else format_seconds_to_hms(total_seconds)
         
         # সামারি ক্যালকুলেশনের জন্য float আওয়ার রাখা (যেমন: ৯.৫ ঘণ্টা)
         d.working_hours_float = total_seconds / 3600.0
 
         d.is_weekend_or_holiday = 0
-        h_list = d.get("holiday_list") or frappe.get_cached_value("Company", d.company, "default_holiday_list")
-        
-        if h_list and d.get("attendance_date"):
-            holiday_record = frappe.db.get_value("Holiday", 
-                {"parent": h_list, "holiday_date": d.attendance_date}, 
-                ["weekly_off"], as_dict=True)
-
-            if holiday_record:
+        if day_types[i]:
+            if day_types[i] != "Working Day":
                 d.is_weekend_or_holiday = 1
-                if holiday_record.weekly_off:
+                if day_types[i] == "Weekend":
                     d.status = _("Weekend")
                 else:
                     d.status = _("Holiday")
@@ -114,21 +414,42 @@ def update_data(data, filters):
                 original_status = d.get("status") or "Absent"
                 if "on leave" in original_status.lower():
                     d.status = _("On Leave")
+                elif compact:
+                    # কর্মঘণ্টা ব্রাউজারে জুড়ে দেওয়া হবে
+                    d.status = original_status
+                    d.show_working_hours = 1
                 else:
                     # এখানে ক্যালকুলেটেড সময় (HMS) দেখাচ্ছে
                     d.status = f"{original_status} ({hms_time})"
 
+        if compact:
+            d.working_hours = int(total_seconds)
+            if late_seconds[i] > 0:
+                d.late_entry_hrs = int(late_seconds[i])
+                d.late_entry = 1
+            if early_seconds[i] > 0:
+                d.early_exit_hrs = int(early_seconds[i])
+                d.early_exit = 1
+            continue
+
         # কলামে ক্যালকুলেটেড সময় সেট করা
         d.working_hours = hms_time
 
-        update_late_entry(d, consider_grace)
-        update_early_exit(d, consider_grace)
+        # স্ট্রিং শুধু লেট/আর্লি রো-এর জন্যই তৈরি হচ্ছে
+        if late_seconds[i] > 0:
+            d.late_entry_hrs = format_duration(late_seconds[i])
+            d.late_entry = 1
+        if early_seconds[i] > 0:
+            d.early_exit_hrs = format_duration(early_seconds[i])
+            d.early_exit = 1
         
         # ফরম্যাটিং (এটি শেষে করা ভালো)
         d.in_time, d.out_time = format_in_out_time(d.in_time, d.out_time, d.attendance_date)
         d.shift_start, d.shift_end = convert_datetime_to_time_for_same_date(d.shift_start, d.shift_end)
 
     return data
+
+
 def get_report_summary(data):
     if not data: return []
 
@@ -174,6 +495,10 @@ def get_report_summary(data):
     # গড় সময়কে HH:mm:ss ফরম্যাটে রূপান্তর
     avg_wh_hms = format_seconds_to_hms(avg_seconds)
 
+    return make_summary_cards(t, p, l, a, e, hol, h, leave, avg_wh_hms)
+
+
+def make_summary_cards(t, p, l, a, e, hol, h, leave, avg_wh_hms):
     return [
         {"value": t, "label": _("Total"), "indicator": "Blue", "datatype": "Int"},
         {"value": p, "label": _("Present"), "indicator": "Green", "datatype": "Int"},
@@ -183,19 +508,91 @@ def get_report_summary(data):
         {"value": hol, "label": _("Holiday"), "indicator": "Purple", "datatype": "Int"},
         {"value": h, "label": _("Half Day"), "indicator": "Orange", "datatype": "Int"},
         {"value": leave, "label": _("Leave"), "indicator": "Yellow", "datatype": "Int"},
-        {"value": avg_wh_hms, "label": _("Avg Wh"), "indicator": "Blue", "datatype": "Data"} 
+        {"value": avg_wh_hms, "label": _("Avg Wh"), "indicator": "Blue", "datatype": "Data"}
     ]
+
+
 def get_chart_data(data):
     if not data: return None
     shifts = {}
     for entry in data:
         s = entry.shift or _("No Shift")
         shifts[s] = shifts.get(s, 0) + 1
+    return make_shift_chart(shifts)
+
+
+def make_shift_chart(shifts):
     return {
         "data": {"labels": list(shifts.keys()), "datasets": [{"values": list(shifts.values())}]},
         "type": "percentage"
     }
 
+def get_summary_data(filters):
+    """Return `(report_summary, chart)` from monthly roll-ups and GROUP BY queries, without fetching detail rows.
+
+    The counters match what get_report_summary and get_chart_data compute from the rows, except
+    for attendance without a shift read from Attendance rather than the fact table: the rows
+    take the shift covering the first punch from ShiftResolver, while SQL only has the late
+    entry and early exit flags of such attendance to count it late or early.
+    """
+    counts = get_attendance_counters(
+        frappe._dict({key: filters.get(key) for key in SUMMARY_FILTER_KEYS}),
+        group_by=("shift",),
+    )
+    if not counts:
+        return [], None
+
+    totals = {key: sum(cint(row[key]) for row in counts) for key in (
+        "total", "present", "late", "absent", "early", "holidays", "half_day", "on_leave"
+    )}
+    working_seconds = sum(flt(row.working_seconds) for row in counts)
+    working_days = totals["present"] + totals["half_day"]
+    avg_seconds = working_seconds / working_days if working_days > 0 else 0
+
+    report_summary = make_summary_cards(
+        totals["total"], totals["present"], totals["late"], totals["absent"], totals["early"],
+        totals["holidays"], totals["half_day"], totals["on_leave"], format_seconds_to_hms(avg_seconds),
+    )
+    chart = make_shift_chart({row.shift or _("No Shift"): cint(row.rows) for row in counts})
+    return report_summary, chart
+
+
+@frappe.whitelist()
+def get_page(filters, after=None, page_size=None):
+    """Rows following the key `after`, `[attendance_date, employee, name]` of the last row
+    fetched, for paginated views. Totals come from get_summary.
+    """
+    if not frappe.get_doc("Report", "Custom Shift Attendance").is_permitted():
+        frappe.throw(_("Not permitted"), frappe.PermissionError)
+
+    filters = frappe._dict(frappe.parse_json(filters))
+    filters.compact = 0
+    validate_filters(filters)
+    after = frappe.parse_json(after) if after else None
+    if after and len(after) != 3:
+        frappe.throw(_("A page key must have the attendance date, employee and attendance ID"))
+
+    with ReportTimer("Custom Shift Attendance", filters, REPORT_FILTER_KEYS) as timer:
+        data = get_data(filters, timer, page=(after, page_size))
+    return {"rows": data, "has_more": len(data) == get_page_size(page_size)}
+
+
+@frappe.whitelist()
+def get_report_filters_key(filters):
+    """Key of the filters, to match them with a `cw_hrms_report_ready` event"""
+    return get_filters_key(frappe._dict(frappe.parse_json(filters)), REPORT_FILTER_KEYS)
+
+
+@frappe.whitelist()
+def get_summary(filters):
+    """Summary cards and chart of the report, for dashboards"""
+    if not frappe.get_doc("Report", "Custom Shift Attendance").is_permitted():
+        frappe.throw(_("Not permitted"), frappe.PermissionError)
+
+    report_summary, chart = get_summary_data(frappe._dict(frappe.parse_json(filters)))
+    return {"report_summary": report_summary, "chart": chart}
+
+
 def format_in_out_time(in_time, out_time, attendance_date):
     if not in_time and not out_time: return None, None
     return convert_datetime_to_time_for_same_date(in_time, out_time)
@@ -208,34 +605,7 @@ def convert_datetime_to_time_for_same_date(start, end):
     return format_datetime(start), format_datetime(end)
 
 def format_float_precision(value):
-    precision = cint(frappe.db.get_default("float_precision")) or 2
-    return flt(value, precision)
-
-def update_late_entry(entry, consider_grace_period):
-    if not entry.in_time or not entry.shift_start: return
-    diff = None
-    if consider_grace_period:
-        grace = entry.late_entry_grace_period if entry.enable_late_entry_marking else 0
-        limit = entry.shift_start + timedelta(minutes=cint(grace))
-        if entry.in_time > limit: diff = entry.in_time - limit
-    elif entry.in_time > entry.shift_start:
-        diff = entry.in_time - entry.shift_start
-    if diff and diff.total_seconds() > 0:
-        entry.late_entry_hrs = format_duration(diff.total_seconds())
-        entry.late_entry = 1
-
-def update_early_exit(entry, consider_grace_period):
-    if not entry.out_time or not entry.shift_end: return
-    diff = None
-    if consider_grace_period:
-        grace = entry.early_exit_grace_period if entry.enable_early_exit_marking else 0
-        limit = entry.shift_end - timedelta(minutes=cint(grace))
-        if entry.out_time < limit: diff = limit - entry.out_time
-    elif entry.out_time < entry.shift_end:
-        diff = entry.shift_end - entry.out_time
-    if diff and diff.total_seconds() > 0:
-        entry.early_exit_hrs = format_duration(diff.total_seconds())
-        entry.early_exit = 1
+    return flt(value, get_general_settings().float_precision)
 
 def format_seconds_to_hms(seconds):
     if not seconds or seconds <= 0:
@@ -0,0 +1,183 @@
+# Copyright (c) 2025, Codeware Limited and contributors
+# For license information, please see license.txt
+
+import hashlib
+import pickle
+import time
+from datetime import timedelta
+
+import frappe
+from frappe.utils import cint, getdate
+
+from cw_hrms.cw_hrms_settings.doctype.general_settings.general_settings import get_general_settings_version
+
+REPORT_CACHE_PREFIX = "cw_hrms:report_cache"
+REPORT_CACHE_INDEX_KEY = "cw_hrms:report_cache:index"
+
+# Defaults, overridable from site_config
+REPORT_CACHE_TTL = 24 * 60 * 60
+REPORT_CACHE_MAX_ENTRIES = 200
+REPORT_CACHE_MAX_MB = 256
+REPORT_CACHE_MAX_ENTRY_MB = 32
+PREPARED_RESULT_TTL = 15 * 60
+
+
+def normalize_filters(filters, keys=None):
+    """Return a stable JSON representation of the filters that affect a report's result.
+
+    With `keys` only those filters are considered, otherwise every filter is.
+    """
+    keys = keys or sorted(filters)
+    normalized = {}
+    for key in keys:
+        value = filters.get(key)
+        if key.endswith("_date") and value:
+            value = str(getdate(value))
+        elif key in ("consider_grace_period", "summary_only", "compact", "show_all_days"):
+            value = cint(value)
+        normalized[key] = value or None
+    return frappe.as_json(normalized, indent=None)
+
+
+def get_filters_key(filters, keys=None):
+    return hashlib.sha1(normalize_filters(filters, keys).encode()).hexdigest()
+
+
+def get_data_version(filters):
+    """Return a cheap stamp that changes whenever data behind a shift attendance report changes.
+
+    Built from the latest `modified` (and row counts, to catch deletions) of Attendance,
+    Attendance Daily Fact, Employee Checkin and Holiday within the filtered range, the
+    monthly roll-ups of those months, plus the latest Shift Type, Shift Assignment and
+    Employee (default shift, holiday list) change, the General Settings version and the
+    float precision. Facts and roll-ups are refreshed by a job after the attendance
+    commits, so they get their own stamps.
+    """
+    from_date = getdate(filters.get("from_date") or "1900-01-01")
+    to_date = getdate(filters.get("to_date") or "2999-12-31")
+    values = {
+        "from_date": from_date,
+        "to_date": to_date,
+        "from_month": from_date.replace(day=1),
+        # checkins of an overnight shift spill into the next day
+        "checkin_to": to_date + timedelta(days=2),
+    }
+
+    version = frappe.db.sql(
+        """
+        SELECT
+            (SELECT CONCAT(COALESCE(MAX(modified), ''), '/', COUNT(*))
+                FROM `tabAttendance`
+                WHERE attendance_date BETWEEN %(from_date)s AND %(to_date)s),
+            (SELECT CONCAT(COALESCE(MAX(modified), ''), '/', COUNT(*))
+                FROM `tabAttendance Daily Fact`
+                WHERE attendance_date BETWEEN %(from_date)s AND %(to_date)s),
+            (SELECT CONCAT(COALESCE(MAX(modified), ''), '/', COUNT(*))
+                FROM `tabAttendance Monthly Rollup`
+                WHERE month BETWEEN %(from_month)s AND %(to_date)s),
+            (SELECT CONCAT(COALESCE(MAX(modified), ''), '/', COUNT(*))
+                FROM `tabEmployee Checkin`
+                WHERE time >= %(from_date)s AND time < %(checkin_to)s),
+            (SELECT CONCAT(COALESCE(MAX(modified), ''), '/', COUNT(*))
+                FROM `tabHoliday`
+                WHERE holiday_date BETWEEN %(from_date)s AND %(to_date)s),
+            (SELECT COALESCE(MAX(modified), '') FROM `tabShift Type`),
+            (SELECT CONCAT(COALESCE(MAX(modified), ''), '/', COUNT(*)) FROM `tabShift Assignment`),
+            (SELECT COALESCE(MAX(modified), '') FROM `tabEmployee`)
+        """,
+        values,
+    )[0]
+    # grace minutes and the float precision change the rows without touching any table above
+    settings = (get_general_settings_version(), frappe.db.get_default("float_precision"))
+    return "|".join(str(v) for v in (*version, *settings))
+
+
+def get_cached_result(namespace, filters, version, keys=None):
+    """Return the cached result for these filters if it was built from the same data version."""
+    cache = frappe.cache()
+    key = get_entry_key(namespace, filters, keys)
+    payload = cache.get(cache.make_key(key))
+    if payload is None:
+        cache.hdel(REPORT_CACHE_INDEX_KEY, key)
+        return None
+
+    entry = pickle.loads(payload)
+    if entry["version"] != version:
+        return None
+
+    cache.hset(REPORT_CACHE_INDEX_KEY, key, (time.time(), len(payload)))
+    return entry["result"]
+
+
+def set_cached_result(namespace, filters, version, result, keys=None):
+    """Cache a report result, evicting least recently used entries to stay within the size bounds."""
+    payload = pickle.dumps({"version": version, "result": result}, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(payload) > get_limit("cw_hrms_report_cache_max_entry_mb", REPORT_CACHE_MAX_ENTRY_MB) * 1024 * 1024:
+        return
+
+    cache = frappe.cache()
+    key = get_entry_key(namespace, filters, keys)
+    ttl = cint(frappe.conf.get("cw_hrms_report_cache_ttl")) or REPORT_CACHE_TTL
+    cache.set(cache.make_key(key), payload, ex=ttl)
+    cache.hset(REPORT_CACHE_INDEX_KEY, key, (time.time(), len(payload)))
+    evict_entries()
+
+
+def set_prepared_result(namespace, filters, result, keys=None):
+    """Keep a result prepared by a background run for the next request with these filters.
+
+    Live data (punches) can move the data version while the run is still going, so the
+    result is kept under its filters alone, for a short while, and served once.
+    """
+    cache = frappe.cache()
+    ttl = cint(frappe.conf.get("cw_hrms_prepared_report_ttl")) or PREPARED_RESULT_TTL
+    cache.set(cache.make_key(get_prepared_key(namespace, filters, keys)), pickle.dumps(result), ex=ttl)
+
+
+def pop_prepared_result(namespace, filters, keys=None):
+    """Return and forget the result prepared for these filters, if any."""
+    cache = frappe.cache()
+    key = cache.make_key(get_prepared_key(namespace, filters, keys))
+    payload = cache.get(key)
+    if payload is None:
+        return None
+    cache.delete(key)
+    return pickle.loads(payload)
+
+
+def evict_entries():
+    cache = frappe.cache()
+    max_entries = get_limit("cw_hrms_report_cache_max_entries", REPORT_CACHE_MAX_ENTRIES)
+    max_bytes = get_limit("cw_hrms_report_cache_max_mb", REPORT_CACHE_MAX_MB) * 1024 * 1024
+
+    index = cache.hgetall(REPORT_CACHE_INDEX_KEY) or {}
+    entries = sorted(
+        ((frappe.safe_decode(key), last_used, size) for key, (last_used, size) in index.items()),
+        key=lambda entry: entry[1],
+    )
+    total_bytes = sum(size for _key, _last_used, size in entries)
+
+    while entries and (len(entries) > max_entries or total_bytes > max_bytes):
+        key, _last_used, size = entries.pop(0)
+        cache.delete(cache.make_key(key))
+        cache.hdel(REPORT_CACHE_INDEX_KEY, key)
+        total_bytes -= size
+
+
+def clear_report_cache():
+    cache = frappe.cache()
+    for key in cache.hgetall(REPORT_CACHE_INDEX_KEY) or {}:
+        cache.delete(cache.make_key(frappe.safe_decode(key)))
+    cache.delete_value(REPORT_CACHE_INDEX_KEY)
+
+
+def get_entry_key(namespace, filters, keys=None):
+    return f"{REPORT_CACHE_PREFIX}:{namespace}:{get_filters_key(filters, keys)}"
+
+
+def get_prepared_key(namespace, filters, keys=None):
+    return f"{REPORT_CACHE_PREFIX}:prepared:{namespace}:{get_filters_key(filters, keys)}"
+
+
+def get_limit(conf_key, default):
+    return cint(frappe.conf.get(conf_key)) or default
@@ -0,0 +1,77 @@
+# Copyright (c) 2026, Codeware Limited and contributors
+# For license information, please see license.txt
+
+from datetime import datetime
+
+import frappe
+from frappe.utils import cint
+
+from cw_hrms.cw_hrms.attendance_kernel import EPOCH
+
+# Defaults, overridable from site_config
+REPORT_PAGE_SIZE = 500
+MAX_REPORT_PAGE_SIZE = 5000
+
+
+def compact_rows(columns, data, dictionary_fields=(), epoch_fields=()):
+    """Return `(columns, rows)` with every row as a list of values in column order.
+
+    Values of `dictionary_fields` become codes into a sorted `dictionary` list set on their
+    column, so sorting by code sorts by value. Code 0 is never used because the report view
+    turns falsy cells into null. Datetimes of `epoch_fields` become whole seconds since the
+    naive EPOCH. The columns are copied, the rows are not kept.
+    """
+    columns = [dict(column) for column in columns]
+    fieldnames = [column["fieldname"] for column in columns]
+
+    codes = {}
+    for column in columns:
+        fieldname = column["fieldname"]
+        if fieldname in dictionary_fields:
+            values = sorted({d.get(fieldname) for d in data} - {None, ""}, key=str)
+            column["dictionary"] = [None, *values]
+            codes[fieldname] = {value: code for code, value in enumerate(values, 1)}
+
+    def encode(fieldname, value):
+        if fieldname in codes:
+            return codes[fieldname].get(value)
+        if fieldname in epoch_fields:
+            return to_epoch(value)
+        return value
+
+    return columns, [[encode(fieldname, d.get(fieldname)) for fieldname in fieldnames] for d in data]
+
+
+def to_epoch(value):
+    if not isinstance(value, datetime):
+        return None
+    return int((value - EPOCH).total_seconds())
+
+
+def paginate(query, fields, after=None, page_size=None):
+    """Order `query` by `fields` and limit it to the page following the key `after`.
+
+    `fields` must be unique together, e.g. end with the row's name, so the order is stable
+    and no row is skipped or repeated between pages. The key condition is expanded into
+    `a > x OR (a = x AND b > y) ...` under `a >= x`, which an index on the leading fields
+    can serve as a range scan, unlike a row comparison.
+    """
+    for field in fields:
+        query = query.orderby(field)
+
+    if after:
+        condition = None
+        for i in range(len(fields)):
+            term = fields[i] > after[i]
+            for field, value in zip(fields[:i], after[:i]):
+                term = (field == value) & term
+            condition = term if condition is None else condition | term
+        query = query.where((fields[0] >= after[0]) & condition)
+
+    return query.limit(get_page_size(page_size))
+
+
+def get_page_size(page_size=None):
+    max_page_size = cint(frappe.conf.get("cw_hrms_max_report_page_size")) or MAX_REPORT_PAGE_SIZE
+    default = cint(frappe.conf.get("cw_hrms_report_page_size")) or REPORT_PAGE_SIZE
+    return min(cint(page_size) or default, max_page_size)
@@ -0,0 +1,183 @@
+# Copyright (c) 2026, Codeware Limited and contributors
+# For license information, please see license.txt
+
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+import frappe
+from frappe import _
+from frappe.utils import cint, now_datetime
+
+from cw_hrms.cw_hrms.report_cache import get_filters_key, normalize_filters
+
+REPORT_TIMING_PREFIX = "cw_hrms:report_timing"
+# Upper bounds (ms) of the histogram buckets, slower runs land in "inf"
+HISTOGRAM_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# Default, overridable from site_config
+REPORT_TIMING_HOURS = 24
+
+
+class ReportTimer:
+    """Wall time, query count and row count per stage of one report run.
+
+    Used as a context manager around the run; queries are counted by wrapping
+    `frappe.db.sql` for its duration. On a clean exit the stages are logged to the
+    `cw_hrms` logger and the total is added to the report's rolling histogram.
+    """
+
+    def __init__(self, report, filters, keys=None):
+        self.report = report
+        self.filters = filters
+        self.keys = keys
+        self.stages = []
+        self.query_count = 0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self.patched_sql = "sql" in vars(frappe.db)
+        sql = self.original_sql = frappe.db.sql
+
+        def counting_sql(*args, **kwargs):
+            self.query_count += 1
+            return sql(*args, **kwargs)
+
+        frappe.db.sql = counting_sql
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.patched_sql:
+            frappe.db.sql = self.original_sql
+        else:
+            del frappe.db.sql
+
+        if exc_type is None:
+            self.log()
+            record_timing(self.report, self.filters, self.keys, self.elapsed_ms())
+
+    @contextmanager
+    def stage(self, name):
+        stage = frappe._dict(name=name, rows=None)
+        queries = self.query_count
+        start = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            stage.wall_ms = round((time.perf_counter() - start) * 1000, 3)
+            stage.queries = self.query_count - queries
+            self.stages.append(stage)
+
+    def elapsed_ms(self):
+        return round((time.perf_counter() - self.started) * 1000, 3)
+
+    def as_dict(self):
+        return {
+            "report": self.report,
+            "filters": normalize_filters(self.filters, self.keys),
+            "total_ms": self.elapsed_ms(),
+            "queries": self.query_count,
+            "stages": self.stages,
+        }
+
+    def log(self):
+        frappe.logger("cw_hrms").info(frappe.as_json(self.as_dict(), indent=None))
+
+    def as_html(self):
+        rows = "".join(
+            f"<tr><td>{stage.name}</td><td>{stage.wall_ms}</td><td>{stage.queries}</td>"
+            f"<td>{'' if stage.rows is None else stage.rows}</td></tr>"
+            for stage in self.stages
+        )
+        return f"""
+            <table class="table table-bordered table-condensed small">
+                <thead><tr><th>{_("Stage")}</th><th>{_("Time (ms)")}</th>
+                    <th>{_("Queries")}</th><th>{_("Rows")}</th></tr></thead>
+                <tbody>{rows}</tbody>
+                <tfoot><tr><th>{_("Total")}</th><th>{self.elapsed_ms()}</th>
+                    <th>{self.query_count}</th><th></th></tr></tfoot>
+            </table>
+        """
+
+
+def show_timings(filters):
+    return bool(filters.get("show_timings")) and "System Manager" in frappe.get_roles()
+
+
+def record_timing(report, filters, keys, total_ms):
+    """Add a run to the histogram of its filter combination in the current hour's bucket."""
+    filters_key = get_filters_key(filters, keys)
+    bucket = next((str(le) for le in HISTOGRAM_BUCKETS if total_ms <= le), "inf")
+
+    cache = frappe.cache()
+    name = cache.make_key(get_hour_key(report, now_datetime()))
+    pipeline = cache.pipeline()
+    pipeline.hset(name, f"{filters_key}|filters", normalize_filters(filters, keys))
+    pipeline.hincrby(name, f"{filters_key}|count", 1)
+    pipeline.hincrbyfloat(name, f"{filters_key}|sum_ms", total_ms)
+    pipeline.hincrby(name, f"{filters_key}|le_{bucket}", 1)
+    pipeline.expire(name, get_retention_hours() * 60 * 60)
+    pipeline.execute()
+
+
+@frappe.whitelist()
+def get_report_timings(report, hours=None):
+    """Run counts and latency histograms per filter combination, slowest first."""
+    frappe.only_for("System Manager")
+
+    hours = min(cint(hours) or get_retention_hours(), get_retention_hours())
+    current = now_datetime()
+    cache = frappe.cache()
+    pipeline = cache.pipeline()
+    for hour in range(hours):
+        pipeline.hgetall(cache.make_key(get_hour_key(report, current - timedelta(hours=hour))))
+
+    combinations = {}
+    for values in pipeline.execute():
+        for field, value in values.items():
+            filters_key, metric = frappe.safe_decode(field).split("|", 1)
+            value = frappe.safe_decode(value)
+            entry = combinations.setdefault(
+                filters_key, {"filters": None, "count": 0, "sum_ms": 0.0, "histogram": {}}
+            )
+            if metric == "filters":
+                entry["filters"] = frappe.parse_json(value)
+            elif metric == "count":
+                entry["count"] += cint(value)
+            elif metric == "sum_ms":
+                entry["sum_ms"] += float(value)
+            else:
+                le = metric.removeprefix("le_")
+                entry["histogram"][le] = entry["histogram"].get(le, 0) + cint(value)
+
+    timings = []
+    for entry in combinations.values():
+        entry["mean_ms"] = round(entry["sum_ms"] / entry["count"], 3)
+        entry["p95_ms"] = get_bucket_percentile(entry["histogram"], entry["count"], 95)
+        entry["sum_ms"] = round(entry["sum_ms"], 3)
+        timings.append(entry)
+
+    # a p95 in the open bucket is slower than any bounded one
+    return sorted(
+        timings,
+        key=lambda entry: float("inf") if entry["p95_ms"] is None else entry["p95_ms"],
+        reverse=True,
+    )
+
+
+def get_bucket_percentile(histogram, count, pct):
+    """Upper bound of the bucket holding the percentile, None for the open bucket."""
+    rank, seen = count * pct / 100, 0
+    for le in HISTOGRAM_BUCKETS:
+        seen += histogram.get(str(le), 0)
+        if seen >= rank:
+            return le
+    return None
+
+
+def get_hour_key(report, hour):
+    return f"{REPORT_TIMING_PREFIX}:{frappe.scrub(report)}:{hour.strftime('%Y%m%d%H')}"
+
+
+def get_retention_hours():
+    return cint(frappe.conf.get("cw_hrms_report_timing_hours")) or REPORT_TIMING_HOURS
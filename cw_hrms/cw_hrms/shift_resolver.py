@@ -0,0 +1,177 @@
+# Copyright (c) 2026, Codeware Limited and contributors
+# For license information, please see license.txt
+
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+import frappe
+from frappe.utils import add_days, cint, get_time, getdate
+
+from cw_hrms.cw_hrms.holiday_calendar import get_company_holiday_lists, get_holiday, get_holiday_calendar
+
+SHIFT_TYPE_FIELDS = (
+    "name",
+    "start_time",
+    "end_time",
+    "holiday_list",
+    "begin_check_in_before_shift_start_time",
+    "allow_check_out_after_shift_end_time",
+    "enable_late_entry_marking",
+    "late_entry_grace_period",
+    "enable_early_exit_marking",
+    "early_exit_grace_period",
+)
+
+
+class ShiftResolver:
+    """Shift occurrences of many employees over a date range, loaded with three queries.
+
+    Every employee gets a list of occurrences sorted by their actual (check-in window)
+    start, built from submitted active Shift Assignments and, on days without one, the
+    employee's default shift. Overnight shifts end on the next day; rotating assignments
+    simply produce a different shift per day. As in HRMS, no shift applies on a holiday.
+    """
+
+    def __init__(self, employees, from_date, to_date, shift_types=None):
+        self.employees = list({e for e in employees if e})
+        # shift types to load besides the assigned and default ones, e.g. of attendance rows
+        self.extra_shift_types = {s for s in shift_types or () if s}
+        # one day of margin on both sides for overnight shifts crossing the range edges
+        self.from_date = getdate(add_days(from_date, -1))
+        self.to_date = getdate(add_days(to_date, 1))
+
+        self.occurrences = {}
+        self.actual_starts = {}
+        self.by_date = {}
+        self.shift_types = {}
+        if self.employees or self.extra_shift_types:
+            self.build()
+
+    def build(self):
+        employees = {
+            e.name: e
+            for e in frappe.get_all(
+                "Employee",
+                filters={"name": ["in", self.employees or [""]]},
+                fields=["name", "default_shift", "holiday_list", "company"],
+            )
+        }
+
+        assignments = {}
+        for a in frappe.get_all(
+            "Shift Assignment",
+            filters={
+                "employee": ["in", self.employees or [""]],
+                "docstatus": 1,
+                "status": "Active",
+                "start_date": ["<=", self.to_date],
+            },
+            or_filters=[["end_date", "is", "not set"], ["end_date", ">=", self.from_date]],
+            fields=["employee", "shift_type", "start_date", "end_date"],
+            order_by="start_date",
+        ):
+            assignments.setdefault(a.employee, []).append(a)
+
+        shift_names = {a.shift_type for rows in assignments.values() for a in rows} | self.extra_shift_types
+        shift_names.update(e.default_shift for e in employees.values() if e.default_shift)
+        self.shift_types = {
+            s.name: s
+            for s in frappe.get_all(
+                "Shift Type", filters={"name": ["in", list(shift_names) or [""]]}, fields=list(SHIFT_TYPE_FIELDS)
+            )
+        }
+
+        company_holiday_lists = get_company_holiday_lists(e.company for e in employees.values() if not e.holiday_list)
+        employee_holiday_lists = {
+            e.name: e.holiday_list or company_holiday_lists.get(e.company) for e in employees.values()
+        }
+        holiday_calendar = get_holiday_calendar(
+            [*employee_holiday_lists.values(), *(s.holiday_list for s in self.shift_types.values())]
+        )
+
+        days = (self.to_date - self.from_date).days + 1
+        for employee, details in employees.items():
+            employee_assignments = assignments.get(employee, [])
+            occurrences = []
+            for day in range(days):
+                date = self.from_date + timedelta(days=day)
+                shifts = [
+                    a.shift_type
+                    for a in employee_assignments
+                    if a.start_date <= date and (not a.end_date or a.end_date >= date)
+                ]
+                if not shifts and details.default_shift:
+                    shifts = [details.default_shift]
+
+                for shift in shifts:
+                    shift_type = self.shift_types.get(shift)
+                    if not shift_type:
+                        continue
+                    holiday_list = shift_type.holiday_list or employee_holiday_lists.get(employee)
+                    if get_holiday(holiday_calendar, holiday_list, date) is not None:
+                        continue
+                    occurrences.append(make_occurrence(shift_type, date))
+
+            occurrences.sort(key=lambda o: o.actual_start)
+            self.occurrences[employee] = occurrences
+            self.actual_starts[employee] = [o.actual_start for o in occurrences]
+            for occurrence in occurrences:
+                self.by_date.setdefault((employee, occurrence.start.date()), []).append(occurrence)
+
+    def get_shift(self, employee, instant, direction=None):
+        """The occurrence whose check-in window covers `instant`, found by bisection.
+
+        With `direction` "reverse" or "forward" the previous or next occurrence is returned
+        when none covers it, like HRMS' get_employee_shift.
+        """
+        occurrences = self.occurrences.get(employee)
+        if not occurrences or not instant:
+            return None
+
+        idx = bisect_right(self.actual_starts[employee], instant)
+        # windows of consecutive occurrences may overlap; prefer the one that started last
+        for candidate in reversed(occurrences[max(idx - 2, 0) : idx]):
+            if candidate.actual_start <= instant <= candidate.actual_end:
+                return candidate
+
+        # the last occurrence starting before `instant` does not cover it, so it has ended
+        if direction == "reverse" and idx:
+            return occurrences[idx - 1]
+        if direction == "forward" and idx < len(occurrences):
+            return occurrences[idx]
+        return None
+
+    def get_shift_for_date(self, employee, date, shift=None):
+        """The occurrence starting on `date`, of `shift` when given."""
+        for occurrence in self.by_date.get((employee, getdate(date)), []):
+            if not shift or occurrence.shift_type == shift:
+                return occurrence
+        return None
+
+    def get_attendance_shift(self, employee, attendance_date, shift=None, in_time=None):
+        """Shift window of an attendance: its shift on its date, else whatever covers the first punch.
+
+        An attendance's own shift applies even on a holiday or outside the employee's assignments.
+        """
+        if not shift:
+            return self.get_shift(employee, in_time)
+
+        occurrence = self.get_shift_for_date(employee, attendance_date, shift)
+        if not occurrence and shift in self.shift_types and attendance_date:
+            occurrence = make_occurrence(self.shift_types[shift], getdate(attendance_date))
+        return occurrence
+
+
+def make_occurrence(shift_type, date):
+    start = datetime.combine(date, get_time(shift_type.start_time))
+    end = datetime.combine(date, get_time(shift_type.end_time))
+    if end <= start:
+        end += timedelta(days=1)
+
+    return frappe._dict(
+        shift_type=shift_type.name,
+        start=start,
+        end=end,
+        actual_start=start - timedelta(minutes=cint(shift_type.begin_check_in_before_shift_start_time)),
+        actual_end=end + timedelta(minutes=cint(shift_type.allow_check_out_after_shift_end_time)),
+    )
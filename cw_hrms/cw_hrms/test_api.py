@@ -0,0 +1,18 @@
+# Copyright (c) 2026, Codeware Limited and Contributors
+# See license.txt
+
+from erpnext.setup.doctype.employee.test_employee import make_employee
+from frappe.tests.utils import FrappeTestCase
+
+from cw_hrms.cw_hrms.api import get_employees_attendance_summary
+
+
+class TestAPI(FrappeTestCase):
+	def test_attendance_summary_of_many_employees(self):
+		# more than one page of get_list
+		employees = [make_employee(f"cw_summary_{i}@example.com", company="_Test Company") for i in range(25)]
+
+		summaries = get_employees_attendance_summary("2025-01-01", "2025-01-31", employees=employees)
+
+		self.assertEqual(set(summaries), set(employees))
+		self.assertEqual(summaries[employees[-1]], {"present": 0, "absent": 0, "late": 0, "leave": 0})
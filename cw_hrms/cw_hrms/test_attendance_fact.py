@@ -0,0 +1,23 @@
+# Copyright (c) 2026, Codeware Limited and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from cw_hrms.cw_hrms.attendance_fact import FACTS_SINCE_KEY, facts_cover
+
+
+class TestAttendanceFact(FrappeTestCase):
+	def setUp(self):
+		since = frappe.db.get_default(FACTS_SINCE_KEY)
+		self.addCleanup(frappe.db.set_default, FACTS_SINCE_KEY, since)
+
+	def test_facts_cover(self):
+		frappe.db.set_default(FACTS_SINCE_KEY, None)
+		self.assertFalse(facts_cover("2025-01-01"))
+
+		frappe.db.set_default(FACTS_SINCE_KEY, "2025-01-01")
+		self.assertTrue(facts_cover("2025-01-01"))
+		self.assertTrue(facts_cover("2025-03-15"))
+		self.assertFalse(facts_cover("2024-12-31"))
+		self.assertFalse(facts_cover(None))
@@ -0,0 +1,28 @@
+# Copyright (c) 2026, Codeware Limited and Contributors
+# See license.txt
+
+from datetime import date
+
+from frappe.tests.utils import FrappeTestCase
+
+from cw_hrms.cw_hrms.attendance_grid import get_holiday_masks, iter_bits
+
+
+class TestAttendanceGrid(FrappeTestCase):
+	def test_holiday_masks(self):
+		holidays = {
+			date(2025, 1, 3): 1,
+			date(2025, 1, 4): 0,
+			# outside the range
+			date(2025, 2, 1): 1,
+		}
+
+		weekends, other = get_holiday_masks(holidays, date(2025, 1, 1), 31)
+
+		self.assertEqual(list(iter_bits(weekends)), [2])
+		self.assertEqual(list(iter_bits(other)), [3])
+
+	def test_iter_bits(self):
+		self.assertEqual(list(iter_bits(0)), [])
+		self.assertEqual(list(iter_bits(0b1010_0001)), [0, 5, 7])
+		self.assertEqual(list(iter_bits(1 << 400)), [400])
@@ -0,0 +1,48 @@
+# Copyright (c) 2025, Codeware Limited and Contributors
+# See license.txt
+
+from datetime import datetime
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from cw_hrms.cw_hrms.attendance_kernel import compute_row_metrics
+
+
+class TestAttendanceKernel(FrappeTestCase):
+	def get_row(self, **kwargs):
+		row = frappe._dict(
+			in_time=datetime(2025, 1, 1, 9, 20),
+			out_time=datetime(2025, 1, 1, 17, 0),
+			shift_start=datetime(2025, 1, 1, 9, 0),
+			shift_end=datetime(2025, 1, 1, 18, 0),
+			enable_late_entry_marking=1,
+			late_entry_grace_period=15,
+			enable_early_exit_marking=1,
+			early_exit_grace_period=15,
+		)
+		row.update(kwargs)
+		return row
+
+	def test_late_and_early_with_grace(self):
+		metrics = compute_row_metrics([self.get_row()], consider_grace_period=1)
+
+		self.assertEqual(metrics.working_seconds[0], 7 * 3600 + 40 * 60)
+		self.assertTrue(metrics.late_entry[0])
+		self.assertEqual(metrics.late_seconds[0], 5 * 60)
+		self.assertTrue(metrics.early_exit[0])
+		self.assertEqual(metrics.early_seconds[0], 45 * 60)
+
+	def test_grace_ignored_when_disabled(self):
+		rows = [self.get_row(in_time=datetime(2025, 1, 1, 9, 10))]
+
+		self.assertTrue(compute_row_metrics(rows, consider_grace_period=0).late_entry[0])
+		self.assertFalse(compute_row_metrics(rows, consider_grace_period=1).late_entry[0])
+
+	def test_missing_timestamps(self):
+		metrics = compute_row_metrics([self.get_row(out_time=None, shift_start=None)], consider_grace_period=1)
+
+		self.assertEqual(metrics.working_seconds[0], 0)
+		self.assertFalse(metrics.has_late_window[0])
+		self.assertFalse(metrics.has_early_window[0])
+		self.assertEqual(metrics.late_seconds[0], 0)
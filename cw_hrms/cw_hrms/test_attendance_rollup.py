@@ -0,0 +1,50 @@
+# Copyright (c) 2026, Codeware Limited and Contributors
+# See license.txt
+
+from datetime import date
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from cw_hrms.cw_hrms.attendance_rollup import ROLLUP_SINCE_KEY, ROLLUP_UNTIL_KEY, split_range
+
+
+class TestAttendanceRollup(FrappeTestCase):
+	def setUp(self):
+		for key in (ROLLUP_SINCE_KEY, ROLLUP_UNTIL_KEY):
+			self.addCleanup(frappe.db.set_default, key, frappe.db.get_default(key))
+
+		# January to March 2025 are rolled up
+		frappe.db.set_default(ROLLUP_SINCE_KEY, "2025-01-01")
+		frappe.db.set_default(ROLLUP_UNTIL_KEY, "2025-04-01")
+
+	def test_whole_months(self):
+		self.assertEqual(split_range("2025-01-01", "2025-03-31"), ((date(2025, 1, 1), date(2025, 3, 1)), []))
+		self.assertEqual(split_range("2025-02-01", "2025-02-28"), ((date(2025, 2, 1), date(2025, 2, 1)), []))
+
+	def test_partial_months_at_the_edges(self):
+		self.assertEqual(
+			split_range("2025-01-15", "2025-03-10"),
+			(
+				(date(2025, 2, 1), date(2025, 2, 1)),
+				[(date(2025, 1, 15), date(2025, 1, 31)), (date(2025, 3, 1), date(2025, 3, 10))],
+			),
+		)
+
+	def test_range_beyond_coverage(self):
+		self.assertEqual(
+			split_range("2024-12-01", "2025-05-31"),
+			(
+				(date(2025, 1, 1), date(2025, 3, 1)),
+				[(date(2024, 12, 1), date(2024, 12, 31)), (date(2025, 4, 1), date(2025, 5, 31))],
+			),
+		)
+
+	def test_no_whole_month(self):
+		self.assertEqual(split_range("2025-02-01", "2025-02-27"), (None, [(date(2025, 2, 1), date(2025, 2, 27))]))
+		self.assertEqual(split_range("2025-04-01", "2025-04-30"), (None, [(date(2025, 4, 1), date(2025, 4, 30))]))
+
+	def test_without_rollups(self):
+		frappe.db.set_default(ROLLUP_SINCE_KEY, None)
+
+		self.assertEqual(split_range("2025-01-01", "2025-03-31"), (None, [("2025-01-01", "2025-03-31")]))
@@ -0,0 +1,53 @@
+# Copyright (c) 2026, Codeware Limited and Contributors
+# See license.txt
+
+from datetime import datetime
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from cw_hrms.cw_hrms.punch_debounce import find_duplicates
+
+
+class TestPunchDebounce(FrappeTestCase):
+	def get_checkin(self, name, minute, second=0, **kwargs):
+		checkin = frappe._dict(
+			name=name,
+			employee="HR-EMP-00001",
+			device_id="GATE-1",
+			log_type="IN",
+			time=datetime(2025, 1, 1, 9, minute, second),
+			attendance=None,
+		)
+		checkin.update(kwargs)
+		return checkin
+
+	def test_repeat_punches_within_window(self):
+		checkins = [
+			self.get_checkin("CKIN-1", 0),
+			self.get_checkin("CKIN-2", 0, 30),
+			# measured from the kept punch, not the previous duplicate
+			self.get_checkin("CKIN-3", 1, 10),
+			self.get_checkin("CKIN-4", 2, 30),
+		]
+
+		duplicates = find_duplicates(checkins, window=60)
+
+		self.assertEqual([d.name for d in duplicates], ["CKIN-2"])
+
+	def test_punches_kept_apart(self):
+		checkins = [
+			self.get_checkin("CKIN-1", 0),
+			self.get_checkin("CKIN-2", 0, 10, device_id="GATE-2"),
+			self.get_checkin("CKIN-3", 0, 20, log_type="OUT"),
+			self.get_checkin("CKIN-4", 0, 30, employee="HR-EMP-00002"),
+			# linked to another attendance than the kept punch
+			self.get_checkin("CKIN-5", 0, 40, attendance="HR-ATT-00002"),
+		]
+
+		self.assertEqual(find_duplicates(checkins, window=60), [])
+
+	def test_unsorted_input(self):
+		checkins = [self.get_checkin("CKIN-2", 0, 30), self.get_checkin("CKIN-1", 0)]
+
+		self.assertEqual([d.name for d in find_duplicates(checkins, window=60)], ["CKIN-2"])
@@ -0,0 +1,47 @@
+# Copyright (c) 2026, Codeware Limited and Contributors
+# See license.txt
+
+from datetime import datetime
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from cw_hrms.cw_hrms.report_payload import MAX_REPORT_PAGE_SIZE, compact_rows, get_page_size, paginate
+
+
+class TestReportPayload(FrappeTestCase):
+	def test_compact_rows(self):
+		columns = [{"fieldname": "employee"}, {"fieldname": "in_time"}, {"fieldname": "working_hours"}]
+		data = [
+			frappe._dict(employee="HR-EMP-00002", in_time=datetime(1970, 1, 2, 9, 0), working_hours=3600),
+			frappe._dict(employee="HR-EMP-00001", in_time=None, working_hours=0),
+			frappe._dict(employee="HR-EMP-00002", in_time=None, working_hours=60),
+		]
+
+		columns, rows = compact_rows(columns, data, ("employee",), ("in_time",))
+
+		self.assertEqual(columns[0]["dictionary"], [None, "HR-EMP-00001", "HR-EMP-00002"])
+		self.assertNotIn("dictionary", columns[1])
+		self.assertEqual(rows, [[2, 86400 + 9 * 3600, 3600], [1, None, 0], [2, None, 60]])
+
+	def test_paginate(self):
+		attendance = frappe.qb.DocType("Attendance")
+		query = frappe.qb.from_(attendance).select(attendance.name)
+		fields = (attendance.attendance_date, attendance.name)
+
+		first_page = paginate(query, fields, None, 2).get_sql()
+		self.assertNotIn("WHERE", first_page)
+		self.assertIn("LIMIT 2", first_page)
+		order_by = first_page.index("ORDER BY")
+		self.assertLess(first_page.index("attendance_date", order_by), first_page.index("name", order_by))
+
+		next_page = paginate(query, fields, ["2025-01-01", "HR-ATT-00001"], 2).get_sql()
+		where = next_page[next_page.index("WHERE") : next_page.index("ORDER BY")]
+		self.assertIn(">='2025-01-01'", where)
+		self.assertIn(">'2025-01-01'", where)
+		self.assertIn("='2025-01-01'", where)
+		self.assertIn(">'HR-ATT-00001'", where)
+
+	def test_page_size(self):
+		self.assertEqual(get_page_size(10), 10)
+		self.assertEqual(get_page_size(10**9), frappe.conf.get("cw_hrms_max_report_page_size") or MAX_REPORT_PAGE_SIZE)
@@ -0,0 +1,77 @@
+# Copyright (c) 2026, Codeware Limited and Contributors
+# See license.txt
+
+from datetime import date, datetime, time
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from cw_hrms.cw_hrms.shift_resolver import ShiftResolver, make_occurrence
+
+EMPLOYEE = "HR-EMP-00001"
+
+
+class TestShiftResolver(FrappeTestCase):
+	def setUp(self):
+		self.day = self.get_shift_type("Day", time(9, 0), time(18, 0))
+		self.night = self.get_shift_type("Night", time(22, 0), time(6, 0))
+
+		# no employees, so nothing is loaded; occurrences are set up as build() would
+		self.resolver = ShiftResolver([], date(2025, 1, 1), date(2025, 1, 3))
+		occurrences = [
+			make_occurrence(self.day, date(2025, 1, 1)),
+			make_occurrence(self.night, date(2025, 1, 1)),
+			make_occurrence(self.day, date(2025, 1, 3)),
+		]
+		self.resolver.occurrences[EMPLOYEE] = occurrences
+		self.resolver.actual_starts[EMPLOYEE] = [o.actual_start for o in occurrences]
+		for occurrence in occurrences:
+			self.resolver.by_date.setdefault((EMPLOYEE, occurrence.start.date()), []).append(occurrence)
+		self.resolver.shift_types = {"Day": self.day, "Night": self.night}
+
+	def get_shift_type(self, name, start_time, end_time):
+		return frappe._dict(
+			name=name,
+			start_time=start_time,
+			end_time=end_time,
+			begin_check_in_before_shift_start_time=60,
+			allow_check_out_after_shift_end_time=60,
+		)
+
+	def test_overnight_occurrence(self):
+		night = self.resolver.occurrences[EMPLOYEE][1]
+
+		self.assertEqual(night.start, datetime(2025, 1, 1, 22, 0))
+		self.assertEqual(night.end, datetime(2025, 1, 2, 6, 0))
+		self.assertEqual(night.actual_start, datetime(2025, 1, 1, 21, 0))
+		self.assertEqual(night.actual_end, datetime(2025, 1, 2, 7, 0))
+
+	def test_get_shift(self):
+		get_shift = self.resolver.get_shift
+
+		self.assertEqual(get_shift(EMPLOYEE, datetime(2025, 1, 1, 8, 0)).shift_type, "Day")
+		self.assertEqual(get_shift(EMPLOYEE, datetime(2025, 1, 1, 19, 0)).shift_type, "Day")
+		# the day shift's check-out window overlaps the night shift's check-in window
+		self.assertEqual(get_shift(EMPLOYEE, datetime(2025, 1, 1, 21, 30)).shift_type, "Night")
+		self.assertEqual(get_shift(EMPLOYEE, datetime(2025, 1, 2, 6, 30)).shift_type, "Night")
+		self.assertIsNone(get_shift(EMPLOYEE, datetime(2025, 1, 2, 12, 0)))
+		self.assertIsNone(get_shift(EMPLOYEE, datetime(2024, 12, 31, 12, 0)))
+		self.assertIsNone(get_shift("HR-EMP-00002", datetime(2025, 1, 1, 9, 0)))
+
+	def test_get_shift_direction(self):
+		instant = datetime(2025, 1, 2, 12, 0)
+
+		self.assertEqual(self.resolver.get_shift(EMPLOYEE, instant, "reverse").start, datetime(2025, 1, 1, 22, 0))
+		self.assertEqual(self.resolver.get_shift(EMPLOYEE, instant, "forward").start, datetime(2025, 1, 3, 9, 0))
+		self.assertIsNone(self.resolver.get_shift(EMPLOYEE, datetime(2025, 1, 4, 12, 0), "forward"))
+
+	def test_get_attendance_shift(self):
+		get_attendance_shift = self.resolver.get_attendance_shift
+
+		self.assertEqual(get_attendance_shift(EMPLOYEE, date(2025, 1, 1), "Night").start, datetime(2025, 1, 1, 22, 0))
+		# the attendance's own shift applies outside the assigned days too
+		self.assertEqual(get_attendance_shift(EMPLOYEE, date(2025, 1, 2), "Day").start, datetime(2025, 1, 2, 9, 0))
+		# without a shift, whatever covers the first punch
+		self.assertEqual(
+			get_attendance_shift(EMPLOYEE, date(2025, 1, 3), in_time=datetime(2025, 1, 3, 9, 5)).shift_type, "Day"
+		)
@@ -1,9 +1,80 @@
 # Copyright (c) 2025, Codeware Limited and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
+from frappe.utils import cint, flt, now
+
+GENERAL_SETTINGS_VERSION_KEY = "cw_hrms:general_settings:version"
+DEFAULT_PUNCH_DEBOUNCE_SECONDS = 60
+
+# {site: (version, settings)}, shared by every request and job of the process
+_general_settings = {}
 
 
 class GeneralSettings(Document):
-	pass
+	def on_update(self):
+		clear_general_settings_cache()
+		# again once committed, so nothing reloads the old values under the new version meanwhile
+		frappe.db.after_commit.add(clear_general_settings_cache)
+
+	def on_trash(self):
+		clear_general_settings_cache()
+		frappe.db.after_commit.add(clear_general_settings_cache)
+
+
+def get_general_settings():
+	"""Return the active General Settings, loaded from the database once per process.
+
+	Each call costs a single Redis read to check that the settings have not been saved
+	since they were loaded. The latest General Settings record is the active one.
+	"""
+	version = get_general_settings_version()
+	site = frappe.local.site
+	cached = _general_settings.get(site)
+	if cached and cached[0] == version:
+		return cached[1]
+
+	settings = load_general_settings()
+	_general_settings[site] = (version, settings)
+	return settings
+
+
+def get_general_settings_version():
+	"""Stamp of the last General Settings save, e.g. for caches of results that depend on them."""
+	cache = frappe.cache()
+	version = cache.get_value(GENERAL_SETTINGS_VERSION_KEY)
+	if version is None:
+		version = now()
+		cache.set_value(GENERAL_SETTINGS_VERSION_KEY, version)
+	return version
+
+
+def load_general_settings():
+	values = frappe.get_all(
+		"General Settings",
+		fields=[
+			"late_in_grace_minutes",
+			"early_out_grace_minutes",
+			"minimum_work_hours",
+			"punch_debounce_seconds",
+			"allow_negative_leave",
+		],
+		order_by="modified desc",
+		limit=1,
+	)
+	values = values[0] if values else frappe._dict()
+
+	return frappe._dict(
+		late_in_grace_minutes=cint(values.late_in_grace_minutes),
+		early_out_grace_minutes=cint(values.early_out_grace_minutes),
+		minimum_work_hours=flt(values.minimum_work_hours),
+		punch_debounce_seconds=cint(values.punch_debounce_seconds) if values else DEFAULT_PUNCH_DEBOUNCE_SECONDS,
+		allow_negative_leave=cint(values.allow_negative_leave),
+		float_precision=cint(frappe.db.get_default("float_precision")) or 2,
+	)
+
+
+def clear_general_settings_cache(doc=None, method=None):
+	frappe.cache().set_value(GENERAL_SETTINGS_VERSION_KEY, now())
+	_general_settings.pop(frappe.local.site, None)
@@ -148,9 +148,9 @@ website_context = {
 # override_doctype_class = {
 # 	"ToDo": "custom_app.overrides.CustomToDo"
 # }
-# override_doctype_class = {
-#     "Shift Type": "cw_hrms.overrides.shift_type.CustomShiftType"
-# }
+override_doctype_class = {
+    "Shift Type": "cw_hrms.overrides.shift_type.CustomShiftType"
+}
 
 # Document Events
 # ---------------
@@ -164,26 +164,88 @@ website_context = {
 # 	}
 # }
 
+doc_events = {
+    "Holiday List": {
+        "on_update": [
+            "cw_hrms.cw_hrms.holiday_calendar.clear_holiday_calendar_cache",
+            "cw_hrms.cw_hrms.attendance_fact.on_holiday_list_update",
+            "cw_hrms.cw_hrms.attendance_rollup.on_holiday_list_update",
+            "cw_hrms.cw_hrms.api.clear_punch_window_cache",
+        ],
+        "on_trash": [
+            "cw_hrms.cw_hrms.holiday_calendar.clear_holiday_calendar_cache",
+            "cw_hrms.cw_hrms.api.clear_punch_window_cache",
+        ],
+    },
+    "Attendance": {
+        "on_submit": [
+            "cw_hrms.cw_hrms.attendance_fact.on_attendance_change",
+            "cw_hrms.cw_hrms.attendance_rollup.on_attendance_change",
+            "cw_hrms.cw_hrms.api.clear_employee_dashboard_cache",
+        ],
+        "on_update_after_submit": [
+            "cw_hrms.cw_hrms.attendance_fact.on_attendance_change",
+            "cw_hrms.cw_hrms.attendance_rollup.on_attendance_change",
+            "cw_hrms.cw_hrms.api.clear_employee_dashboard_cache",
+        ],
+        "on_cancel": [
+            "cw_hrms.cw_hrms.attendance_fact.on_attendance_change",
+            "cw_hrms.cw_hrms.attendance_rollup.on_attendance_change",
+            "cw_hrms.cw_hrms.api.clear_employee_dashboard_cache",
+        ],
+    },
+    "Leave Application": {
+        "on_submit": "cw_hrms.cw_hrms.api.clear_employee_dashboard_cache",
+        "on_update_after_submit": "cw_hrms.cw_hrms.api.clear_employee_dashboard_cache",
+        "on_cancel": "cw_hrms.cw_hrms.api.clear_employee_dashboard_cache",
+    },
+    "Leave Allocation": {
+        "on_submit": "cw_hrms.cw_hrms.api.clear_employee_dashboard_cache",
+        "on_update_after_submit": "cw_hrms.cw_hrms.api.clear_employee_dashboard_cache",
+        "on_cancel": "cw_hrms.cw_hrms.api.clear_employee_dashboard_cache",
+    },
+    "Employee": {
+        "on_update": [
+            "cw_hrms.cw_hrms.punch_ingestion.clear_employee_directory_cache",
+            "cw_hrms.cw_hrms.api.clear_punch_window_cache",
+        ],
+        "on_trash": "cw_hrms.cw_hrms.punch_ingestion.clear_employee_directory_cache",
+    },
+    "Shift Assignment": {
+        "on_submit": "cw_hrms.cw_hrms.api.clear_punch_window_cache",
+        "on_update_after_submit": "cw_hrms.cw_hrms.api.clear_punch_window_cache",
+        "on_cancel": "cw_hrms.cw_hrms.api.clear_punch_window_cache",
+    },
+    "Shift Type": {
+        "on_update": "cw_hrms.cw_hrms.api.clear_punch_window_cache",
+        "on_trash": "cw_hrms.cw_hrms.api.clear_punch_window_cache",
+    },
+    "General Settings": {
+        "on_update": "cw_hrms.cw_hrms.attendance_fact.on_general_settings_change",
+        "after_delete": "cw_hrms.cw_hrms.attendance_fact.on_general_settings_change",
+    },
+    "System Settings": {
+        "on_update": "cw_hrms.cw_hrms_settings.doctype.general_settings.general_settings.clear_general_settings_cache",
+    },
+    "Employee Checkin": {
+        "on_update": "cw_hrms.cw_hrms.attendance_fact.on_checkin_change",
+        "on_trash": "cw_hrms.cw_hrms.attendance_fact.on_checkin_change",
+    },
+}
+
 # Scheduled Tasks
 # ---------------
 
-# scheduler_events = {
-# 	"all": [
-# 		"cw_hrms.tasks.all"
-# 	],
-# 	"daily": [
-# 		"cw_hrms.tasks.daily"
-# 	],
-# 	"hourly": [
-# 		"cw_hrms.tasks.hourly"
-# 	],
-# 	"weekly": [
-# 		"cw_hrms.tasks.weekly"
-# 	],
-# 	"monthly": [
-# 		"cw_hrms.tasks.monthly"
-# 	],
-# }
+scheduler_events = {
+    "cron": {
+        "*/5 * * * *": [
+            "cw_hrms.tasks.process_incremental_attendance",
+        ],
+    },
+    "monthly_long": [
+        "cw_hrms.tasks.finalize_monthly_rollups",
+    ],
+}
 
 # Testing
 # -------
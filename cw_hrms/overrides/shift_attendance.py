@@ -1,20 +1,29 @@
 # -*- coding: utf-8 -*-
 # Custom Shift Attendance Report Override
-from datetime import timedelta
 import frappe
 from frappe import _
 from frappe.utils import cint, flt, format_datetime, format_duration
 
+from cw_hrms.cw_hrms.attendance_kernel import compute_row_metrics
+from cw_hrms.cw_hrms.report_cache import get_cached_result, get_data_version, set_cached_result
+from cw_hrms.cw_hrms.shift_resolver import ShiftResolver
+from cw_hrms.cw_hrms_settings.doctype.general_settings.general_settings import get_general_settings
+
 def execute(filters=None):
-    print(">>> Custom Shift Attendance Override Executed <<<")
-    frappe.msgprint("Custom Shift Attendance Override Executed", title="Debug", indicator="green")
-    
     filters = filters or {}
+
+    data_version = get_data_version(filters)
+    cached = get_cached_result("shift_attendance", filters, data_version)
+    if cached:
+        return cached
+
     columns = get_columns()
     data = get_data(filters)
     chart = get_chart_data(data)
     report_summary = get_report_summary(data)
-    return columns, data, None, chart, report_summary
+    result = columns, data, None, chart, report_summary
+    set_cached_result("shift_attendance", filters, data_version, result)
+    return result
 
 
 
@@ -48,13 +57,12 @@ def get_data(filters):
 
 
 def get_query(filters):
+    """Attendance rows; shift timings are filled in by update_data from a ShiftResolver."""
     attendance = frappe.qb.DocType("Attendance")
-    checkin = frappe.qb.DocType("Employee Checkin")
     shift_type = frappe.qb.DocType("Shift Type")
 
     query = (
         frappe.qb.from_(attendance)
-        .left_join(checkin).on(checkin.attendance == attendance.name)
         .inner_join(shift_type).on(attendance.shift == shift_type.name)
         .select(
             attendance.name,
@@ -70,19 +78,18 @@ def get_query(filters):
             attendance.early_exit,
             attendance.department,
             attendance.company,
-            checkin.shift_start,
-            checkin.shift_end,
-            checkin.shift_actual_start,
-            checkin.shift_actual_end,
             shift_type.enable_late_entry_marking,
             shift_type.late_entry_grace_period,
             shift_type.enable_early_exit_marking,
             shift_type.early_exit_grace_period,
         )
         .where(attendance.docstatus == 1)
-        .groupby(attendance.name)
     )
 
+    return apply_filters(query, attendance, filters)
+
+
+def apply_filters(query, attendance, filters):
     for key in filters or {}:
         if key == "from_date":
             query = query.where(attendance.attendance_date >= filters.from_date)
@@ -97,7 +104,16 @@ def get_query(filters):
 
 
 def update_data(data, consider_grace_period):
-    for d in data:
+    set_shift_timings(data)
+    settings = get_general_settings()
+    metrics = compute_row_metrics(
+        data, consider_grace_period, settings.late_in_grace_minutes, settings.early_out_grace_minutes
+    )
+    late_seconds, late_entry = metrics.late_seconds.tolist(), metrics.late_entry.tolist()
+    early_seconds, early_exit = metrics.early_seconds.tolist(), metrics.early_exit.tolist()
+    has_late_window, has_early_window = metrics.has_late_window.tolist(), metrics.has_early_window.tolist()
+
+    for i, d in enumerate(data):
         # Fill missing checkin/shift fields safely
         d.shift_actual_start = d.shift_actual_start or d.shift_start
         d.shift_actual_end = d.shift_actual_end or d.shift_end
@@ -107,17 +123,19 @@ def update_data(data, consider_grace_period):
         d.late_entry = d.late_entry or 0
         d.early_exit = d.early_exit or 0
 
-        if d.in_time:
-            update_late_entry(d, consider_grace_period)
+        if has_late_window[i]:
+            d.late_entry = 1 if late_entry[i] else 0
+            d.late_entry_hrs = format_duration(late_seconds[i])
         else:
             d.late_entry_hrs = None
 
-        if d.out_time:
-            update_early_exit(d, consider_grace_period)
+        if has_early_window[i]:
+            d.early_exit = 1 if early_exit[i] else 0
+            d.early_exit_hrs = format_duration(early_seconds[i])
         else:
             d.early_exit_hrs = None
 
-        d.working_hours = format_float_precision(d.working_hours)
+        d.working_hours = flt(d.working_hours, settings.float_precision)
         d.in_time, d.out_time = format_in_out_time(d.in_time, d.out_time, d.attendance_date)
         d.shift_start, d.shift_end = convert_datetime_to_time_for_same_date(d.shift_start, d.shift_end)
         d.shift_actual_start, d.shift_actual_end = convert_datetime_to_time_for_same_date(
@@ -127,9 +145,23 @@ def update_data(data, consider_grace_period):
 
 
 
+def set_shift_timings(data):
+    if not data:
+        return
+
+    dates = [d.attendance_date for d in data]
+    resolver = ShiftResolver({d.employee for d in data}, min(dates), max(dates), shift_types={d.shift for d in data})
+    for d in data:
+        shift = resolver.get_attendance_shift(d.employee, d.attendance_date, d.shift, d.in_time)
+        if shift:
+            d.shift_start, d.shift_end = shift.start, shift.end
+            d.shift_actual_start, d.shift_actual_end = shift.actual_start, shift.actual_end
+        else:
+            d.shift_start = d.shift_end = d.shift_actual_start = d.shift_actual_end = None
+
+
 def format_float_precision(value):
-    precision = cint(frappe.db.get_default("float_precision")) or 2
-    return flt(value, precision)
+    return flt(value, get_general_settings().float_precision)
 
 
 def format_in_out_time(in_time, out_time, attendance_date):
@@ -152,53 +184,7 @@ def convert_datetime_to_time_for_same_date(start, end):
     return start, end
 
 
-def update_late_entry(entry, consider_grace_period):
-    if not entry.in_time or not entry.shift_start:
-        entry.late_entry_hrs = None
-        return
-
-    if consider_grace_period and entry.enable_late_entry_marking:
-        entry_grace_period = entry.late_entry_grace_period or 0
-        start_time = entry.shift_start + timedelta(minutes=entry_grace_period)
-        entry.late_entry_hrs = max(entry.in_time - start_time, timedelta(seconds=0))
-        entry.late_entry = 1 if entry.late_entry_hrs.total_seconds() > 0 else 0
-    elif entry.in_time > entry.shift_start:
-        entry.late_entry = 1
-        entry.late_entry_hrs = entry.in_time - entry.shift_start
-    else:
-        entry.late_entry_hrs = timedelta(seconds=0)
-        entry.late_entry = 0
-
-    entry.late_entry_hrs = format_duration(entry.late_entry_hrs.total_seconds())
-
-
-
-def update_early_exit(entry, consider_grace_period):
-    if not entry.out_time or not entry.shift_end:
-        entry.early_exit_hrs = None
-        return
-
-    if consider_grace_period and entry.enable_early_exit_marking:
-        exit_grace_period = entry.early_exit_grace_period or 0
-        end_time = entry.shift_end - timedelta(minutes=exit_grace_period)
-        entry.early_exit_hrs = max(end_time - entry.out_time, timedelta(seconds=0))
-        entry.early_exit = 1 if entry.early_exit_hrs.total_seconds() > 0 else 0
-    elif entry.out_time < entry.shift_end:
-        entry.early_exit = 1
-        entry.early_exit_hrs = entry.shift_end - entry.out_time
-    else:
-        entry.early_exit_hrs = timedelta(seconds=0)
-        entry.early_exit = 0
-
-    entry.early_exit_hrs = format_duration(entry.early_exit_hrs.total_seconds())
-
-
-
 def get_report_summary(data):
-    print("This is Custom method override process_auto_attendance")
-	custom_message = "This is Custom method override shift atteendace report"
-	frappe.msgprint(custom_message, title="Custom Validation Check", indicator="green")
-	frappe.throw(custom_message)
     if not data:
         return None
 
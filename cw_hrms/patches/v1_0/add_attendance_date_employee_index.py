@@ -0,0 +1,9 @@
+import frappe
+
+
+def execute():
+    if not frappe.db.table_exists("Attendance"):
+        return
+
+    # serves the keyset pages of the shift attendance reports, ordered by (attendance_date, employee, name)
+    frappe.db.add_index("Attendance", ["attendance_date", "employee"], index_name="attendance_date_employee_index")
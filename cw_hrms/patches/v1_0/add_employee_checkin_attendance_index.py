@@ -0,0 +1,8 @@
+import frappe
+
+
+def execute():
+    if not frappe.db.table_exists("Employee Checkin"):
+        return
+
+    frappe.db.add_index("Employee Checkin", ["attendance"], index_name="attendance_index")
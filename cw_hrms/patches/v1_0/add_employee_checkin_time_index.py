@@ -0,0 +1,9 @@
+import frappe
+
+
+def execute():
+    if not frappe.db.table_exists("Employee Checkin"):
+        return
+
+    # the report's data version stamps checkins by a range on time alone
+    frappe.db.add_index("Employee Checkin", ["time"], index_name="time_index")
@@ -0,0 +1,19 @@
+import frappe
+from frappe.utils import add_days
+
+from cw_hrms.cw_hrms.attendance_rollup import get_rollup_coverage, rebuild_monthly_rollups
+
+
+def execute():
+    # late_entry_records is new, fill it in for every rolled-up month
+    since, until = get_rollup_coverage()
+    if not since:
+        return
+
+    frappe.enqueue(
+        rebuild_monthly_rollups,
+        queue="long",
+        timeout=4 * 60 * 60,
+        from_date=since,
+        to_date=add_days(until, -1),
+    )
@@ -0,0 +1,10 @@
+from cw_hrms.cw_hrms.attendance_rollup import finalize_monthly_rollups as finalize_rollups
+from cw_hrms.cw_hrms.auto_attendance import enqueue_incremental_attendance
+
+
+def process_incremental_attendance():
+    enqueue_incremental_attendance()
+
+
+def finalize_monthly_rollups():
+    finalize_rollups()